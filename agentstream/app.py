@@ -9,6 +9,7 @@ from typing import Any
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, ScrollableContainer, Vertical
+from textual.events import Resize
 from textual.message import Message
 from textual.reactive import reactive
 from textual.screen import ModalScreen
@@ -17,10 +18,10 @@ from rich.text import Text
 
 from agentstream.events import Agent, ActionType, AgentEvent, SessionInfo
 from agentstream.theme import (
-    render_event, render_logo, render_separator, SEPARATOR_ACTIONS,
+    render_event, render_logo, render_separator, join_lines, SEPARATOR_ACTIONS,
     ACCENT, SYSTEM_DIM, SEPARATOR_COLOR,
     CLAUDE_PRIMARY, CLAUDE_DIM, CODEX_PRIMARY, CODEX_DIM,
-    BG_DARK, BG_PANEL, BG_BAR, AGENT_COLORS, HELP_CONTENT,
+    BG_DARK, BG_PANEL, BG_BAR, AGENT_COLORS, HELP_TEXT,
     session_color,
 )
 from agentstream.streams import demo_stream, stdin_stream, file_stream, exec_stream, watch_stream
@@ -28,6 +29,9 @@ from agentstream.streams import demo_stream, stdin_stream, file_stream, exec_str
 # Max events buffered while paused (prevent unbounded memory growth)
 _PAUSE_BUFFER_MAX = 50_000
 
+# Below this terminal width, events render in compact mode
+_COMPACT_WIDTH = 100
+
 
 # ---------------------------------------------------------------------------
 # Session toggle widget (sidebar item)
@@ -69,6 +73,8 @@ class SessionToggle(Static):
         self.session_id = session_id
         self.agent = agent
         self.display_name = display_name
+        # Built once; render() runs again on every event count update
+        self._agent_label = f"{agent.value.upper()[:3]} "
         self._color = color
         self._color_dim = color_dim
 
@@ -82,7 +88,7 @@ class SessionToggle(Static):
 
         t = Text()
         t.append(f" {icon} ", style=style)
-        t.append(f"{self.agent.value.upper()[:3]} ", style=style)
+        t.append(self._agent_label, style=style)
         t.append(self.display_name[:14], style=f"dim {dim}")
         t.append(f"  {self.event_count}", style=f"dim {SYSTEM_DIM}")
         return t
@@ -167,7 +173,7 @@ class HelpScreen(ModalScreen[None]):
     ]
 
     def compose(self) -> ComposeResult:
-        yield Static(HELP_CONTENT, id="help-dialog", markup=True)
+        yield Static(HELP_TEXT, id="help-dialog")
 
 
 # ---------------------------------------------------------------------------
@@ -289,6 +295,7 @@ class AgentStreamApp(App):
         self._codex_count = 0
         self._total_cost = 0.0
         self._last_action: ActionType | None = None
+        self._compact = False
         self._pause_buffer: deque[AgentEvent] = deque(maxlen=_PAUSE_BUFFER_MAX)
 
     def compose(self) -> ComposeResult:
@@ -316,6 +323,10 @@ class AgentStreamApp(App):
         for source_type, config in self.sources:
             self._start_source(source_type, config)
 
+    def on_resize(self, event: Resize) -> None:
+        # Narrow terminals drop the timestamp and action columns
+        self._compact = event.size.width < _COMPACT_WIDTH
+
     def _start_source(self, source_type: str, config: Any) -> None:
         if source_type == "demo":
             self._consume(demo_stream())
@@ -367,8 +378,8 @@ class AgentStreamApp(App):
                 pass
 
         # Track cost from result/metadata
-        if event.metadata and "total_cost_usd" in event.metadata:
-            cost = event.metadata["total_cost_usd"]
+        if event.metadata:
+            cost = event.metadata.get("total_cost_usd")
             if cost:
                 self._total_cost += cost
 
@@ -390,10 +401,16 @@ class AgentStreamApp(App):
     def _write_event_to_log(self, event: AgentEvent) -> None:
         """Render and write a single event to the RichLog."""
         log = self.query_one("#stream-log", RichLog)
+        for line in self._render_event_lines(event):
+            log.write(line)
+
+    def _render_event_lines(self, event: AgentEvent) -> list[Text]:
+        """Render an event (plus any separator before it) and advance log state."""
+        lines: list[Text] = []
 
         # Insert separator before major events
         if event.action in SEPARATOR_ACTIONS and self._last_action not in (None, ActionType.STREAM_START):
-            log.write(render_separator())
+            lines.append(render_separator())
 
         # Look up per-session colors (if the session is registered)
         colors = None
@@ -402,16 +419,23 @@ class AgentStreamApp(App):
             if info.color:
                 colors = (info.color, info.color_dim)
 
-        log.write(render_event(event, colors=colors))
+        lines.append(render_event(event, colors=colors, compact=self._compact))
         self._last_action = event.action
         self.event_count += 1
+        return lines
 
     def _flush_pause_buffer(self) -> None:
-        """Write all buffered events to the log, respecting current filters."""
+        """Write all buffered events to the log, respecting current filters.
+
+        The backlog is joined into a single Text so it costs one log write.
+        """
+        lines: list[Text] = []
         while self._pause_buffer:
             event = self._pause_buffer.popleft()
             if self._should_display(event):
-                self._write_event_to_log(event)
+                lines.extend(self._render_event_lines(event))
+        if lines:
+            self.query_one("#stream-log", RichLog).write(join_lines(lines))
 
     def _should_display(self, event: AgentEvent) -> bool:
         """Check if event should be displayed based on current filters."""
@@ -437,18 +461,15 @@ class AgentStreamApp(App):
         sid = event.session_id
         agent = event.agent
 
-        # Generate display name — prefer slug (session name) from Claude data
+        # Generate display name — prefer slug (session name) from Claude data.
+        # Slugs are like "sparkling-crafting-hummingbird" — use the last word
+        # as it's most distinctive.
+        meta = event.metadata or {}
         if sid.startswith("demo-"):
             name = "Demo"
-        elif event.metadata and event.metadata.get("slug"):
-            # Slugs are like "sparkling-crafting-hummingbird" —
-            # use the last word as it's most distinctive
-            slug = event.metadata["slug"]
-            name = slug.rsplit("-", 1)[-1]
-        elif event.metadata and event.metadata.get("project_name"):
-            name = event.metadata["project_name"]
         else:
-            name = sid[:8]
+            slug = meta.get("slug")
+            name = (slug and slug.rsplit("-", 1)[-1]) or meta.get("project_name") or sid[:8]
 
         # Assign a deterministic per-session color
         primary, dim = session_color(sid)
@@ -58,10 +58,10 @@ class AgentEvent:
     content: str
     timestamp: datetime = field(default_factory=datetime.now)
     session_id: str = ""
-    metadata: Optional[dict] = field(default_factory=dict)
+    metadata: Optional[dict] = None  # Allocated only by events that carry extra data
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionInfo:
     """Tracks a detected stream/session in the sidebar."""
     session_id: str
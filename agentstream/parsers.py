@@ -1,17 +1,92 @@
 """Parsers for Claude SSE, Claude CLI JSONL, and Codex JSONL stream formats."""
 
 import json
-from typing import Optional
+import re
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
 
 from agentstream.events import Agent, ActionType, AgentEvent
 
+def _reject_constant(name: str):
+    raise ValueError(f"non-standard JSON constant: {name}")
+
+
+_STRICT_DECODER = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+def _loads_stdlib(data: str | bytes):
+    """json.loads, but rejecting NaN/Infinity the way orjson does."""
+    if not isinstance(data, str):
+        data = data.decode()  # UnicodeDecodeError is a ValueError too
+    return _STRICT_DECODER.decode(data)
+
+
+# orjson is an optional speedup for the per-line decode. Both decoders accept
+# str or bytes and raise ValueError subclasses on malformed input, including
+# NaN/Infinity. One difference remains: orjson decodes integers beyond 64 bits
+# as floats (1e+23) where the stdlib keeps them exact. Token counts and the
+# like never get near that.
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on the environment
+    _loads = _loads_stdlib
+
+# Shared read-only default for nested .get() lookups, so a missing (or present)
+# key doesn't allocate a throwaway dict as the default argument
+_EMPTY: Mapping = MappingProxyType({})
+
+# Enum member access goes through a descriptor on every lookup, and the
+# parsers build an event per line, so bind the members they use to globals.
+_CLAUDE = Agent.CLAUDE
+_CODEX = Agent.CODEX
+_AGENT_MESSAGE = ActionType.AGENT_MESSAGE
+_COMMAND = ActionType.COMMAND
+_COMPACT = ActionType.COMPACT
+_ERROR = ActionType.ERROR
+_FILE_CHANGE = ActionType.FILE_CHANGE
+_INIT = ActionType.INIT
+_MCP_TOOL = ActionType.MCP_TOOL
+_MESSAGE_START = ActionType.MESSAGE_START
+_MESSAGE_STOP = ActionType.MESSAGE_STOP
+_REASONING = ActionType.REASONING
+_RESULT = ActionType.RESULT
+_TASK_UPDATE = ActionType.TASK_UPDATE
+_TEXT_DELTA = ActionType.TEXT_DELTA
+_THINKING = ActionType.THINKING
+_THREAD_START = ActionType.THREAD_START
+_TOOL_RESULT = ActionType.TOOL_RESULT
+_TOOL_USE = ActionType.TOOL_USE
+_TURN_COMPLETE = ActionType.TURN_COMPLETE
+_TURN_FAILED = ActionType.TURN_FAILED
+_TURN_START = ActionType.TURN_START
+_USER_PROMPT = ActionType.USER_PROMPT
+_WEB_SEARCH = ActionType.WEB_SEARCH
+
+
+def _compile_for_lines(pattern: str) -> dict[type, re.Pattern]:
+    """Compile *pattern* for both str and bytes lines, keyed by line type."""
+    return {str: re.compile(pattern), bytes: re.compile(pattern.encode())}
+
 
 class BaseParser:
     """Base class for stream parsers."""
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
+        """Parse one line (str, or undecoded UTF-8 bytes) into an event, if any."""
         raise NotImplementedError
 
+    def parse_lines(self, lines: Iterable[str | bytes]) -> list[AgentEvent]:
+        """Parse a batch of lines, dropping lines that produce no event."""
+        parse = self.parse_line
+        events: list[AgentEvent] = []
+        append = events.append
+        for line in lines:
+            event = parse(line)
+            if event:
+                append(event)
+        return events
+
 
 # ---------------------------------------------------------------------------
 # Claude API SSE parser (raw HTTP streaming)
@@ -26,100 +101,123 @@ class ClaudeSSEParser(BaseParser):
 
     def __init__(self):
         self._event_type: Optional[str] = None
-        self._data_lines: list[str] = []
+        # Encoded payload of the pending event's data: lines, joined with "\n"
+        self._data = bytearray()
+        self._has_data = False
         self._session_id: str = ""
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
-        line = line.rstrip("\r\n")
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
+        # Work on bytes so data: payloads go to the decoder without a round-trip
+        if isinstance(line, str):
+            line = line.encode()
+        line = line.rstrip(b"\r\n")
 
-        if line.startswith("event: "):
-            self._event_type = line[7:]
-            return None
-        elif line.startswith("data: "):
-            self._data_lines.append(line[6:])
-            return None
-        elif line == "":
-            if self._data_lines:
-                data_str = "\n".join(self._data_lines)
-                event = self._process(self._event_type, data_str)
+        # Blank line dispatches the pending event
+        if not line:
+            if self._has_data:
+                event = self._process(self._event_type, self._data)
                 self._event_type = None
-                self._data_lines = []
+                self._data.clear()
+                self._has_data = False
                 return event
             return None
-        return None
-
-    def _process(self, event_type: Optional[str], data: str) -> Optional[AgentEvent]:
-        try:
-            payload = json.loads(data)
-        except json.JSONDecodeError:
-            return AgentEvent(Agent.CLAUDE, ActionType.ERROR, f"Bad JSON: {data[:80]}")
 
-        etype = payload.get("type", event_type or "unknown")
-
-        if etype == "message_start":
-            msg = payload.get("message", {})
-            model = msg.get("model", "unknown")
-            self._session_id = msg.get("id", self._session_id)
-            return AgentEvent(
-                Agent.CLAUDE, ActionType.MESSAGE_START,
-                f"Session started ({model})", session_id=self._session_id,
-            )
-
-        elif etype == "content_block_start":
-            block = payload.get("content_block", {})
-            block_type = block.get("type", "")
-            if block_type == "thinking":
-                return AgentEvent(Agent.CLAUDE, ActionType.THINKING, "Thinking...",
-                                  session_id=self._session_id)
-            elif block_type == "tool_use":
-                name = block.get("name", "unknown_tool")
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE, f"Calling {name}",
-                                  session_id=self._session_id)
+        # "field: value", with at most one space after the colon; a line
+        # starting with ":" is a comment and one without a colon has no value
+        colon = line.find(b":")
+        if colon == 0:
             return None
+        if colon < 0:
+            field, value = line, b""
+        else:
+            field = line[:colon]
+            start = colon + 2 if line[colon + 1:colon + 2] == b" " else colon + 1
+            value = line[start:]
+
+        if field == b"data":
+            if self._has_data:
+                self._data += b"\n"
+            self._data += value
+            self._has_data = True
+        elif field == b"event":
+            self._event_type = value.decode(errors="replace")
+        return None
 
-        elif etype == "content_block_delta":
-            delta = payload.get("delta", {})
-            dt = delta.get("type", "")
-            if dt == "text_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.TEXT_DELTA,
-                                  delta.get("text", ""), session_id=self._session_id)
-            elif dt == "thinking_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.THINKING,
-                                  delta.get("thinking", ""), session_id=self._session_id)
-            elif dt == "input_json_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
-                                  delta.get("partial_json", ""), session_id=self._session_id)
-            return None
+    def _process(self, event_type: Optional[str], data: bytearray) -> Optional[AgentEvent]:
+        # Unlike JSONL lines the payload isn't stripped, so allow leading space
+        payload = _decode_object(data.lstrip())
+        if payload is None:
+            return AgentEvent(_CLAUDE, _ERROR, f"Bad JSON: {_preview(data)}")
 
-        elif etype == "content_block_stop":
-            return None
+        handler = self._HANDLERS.get(payload.get("type", event_type or "unknown"))
+        return handler(self, payload) if handler else None
 
-        elif etype == "message_delta":
-            delta = payload.get("delta", {})
-            stop = delta.get("stop_reason", "")
-            usage = payload.get("usage", {})
-            tokens = usage.get("output_tokens", "")
-            parts = [p for p in [stop, f"{tokens} tokens" if tokens else ""] if p]
-            if parts:
-                return AgentEvent(Agent.CLAUDE, ActionType.MESSAGE_STOP,
-                                  " | ".join(parts), session_id=self._session_id)
-            return None
+    def _parse_message_start(self, payload: dict) -> Optional[AgentEvent]:
+        msg = payload.get("message", _EMPTY)
+        model = msg.get("model", "unknown")
+        self._session_id = msg.get("id", self._session_id)
+        return AgentEvent(
+            _CLAUDE, _MESSAGE_START,
+            f"Session started ({model})", session_id=self._session_id,
+        )
 
-        elif etype == "message_stop":
-            return AgentEvent(Agent.CLAUDE, ActionType.MESSAGE_STOP, "Complete",
+    def _parse_content_block_start(self, payload: dict) -> Optional[AgentEvent]:
+        block = payload.get("content_block", _EMPTY)
+        block_type = block.get("type", "")
+        if block_type == "thinking":
+            return AgentEvent(_CLAUDE, _THINKING, "Thinking...",
                               session_id=self._session_id)
-
-        elif etype == "ping":
-            return None
-
-        elif etype == "error":
-            error = payload.get("error", {})
-            return AgentEvent(Agent.CLAUDE, ActionType.ERROR,
-                              error.get("message", "Unknown error"),
+        elif block_type == "tool_use":
+            name = block.get("name", "unknown_tool")
+            return AgentEvent(_CLAUDE, _TOOL_USE, f"Calling {name}",
                               session_id=self._session_id)
+        return None
+
+    def _parse_content_block_delta(self, payload: dict) -> Optional[AgentEvent]:
+        delta = payload.get("delta", _EMPTY)
+        dt = delta.get("type", "")
+        if dt == "text_delta":
+            return AgentEvent(_CLAUDE, _TEXT_DELTA,
+                              delta.get("text", ""), session_id=self._session_id)
+        elif dt == "thinking_delta":
+            return AgentEvent(_CLAUDE, _THINKING,
+                              delta.get("thinking", ""), session_id=self._session_id)
+        elif dt == "input_json_delta":
+            return AgentEvent(_CLAUDE, _TOOL_USE,
+                              delta.get("partial_json", ""), session_id=self._session_id)
+        return None
 
+    def _parse_message_delta(self, payload: dict) -> Optional[AgentEvent]:
+        delta = payload.get("delta", _EMPTY)
+        stop = delta.get("stop_reason", "")
+        usage = payload.get("usage", _EMPTY)
+        tokens = usage.get("output_tokens", "")
+        parts = [p for p in [stop, f"{tokens} tokens" if tokens else ""] if p]
+        if parts:
+            return AgentEvent(_CLAUDE, _MESSAGE_STOP,
+                              " | ".join(parts), session_id=self._session_id)
         return None
 
+    def _parse_message_stop(self, payload: dict) -> Optional[AgentEvent]:
+        return AgentEvent(_CLAUDE, _MESSAGE_STOP, "Complete",
+                          session_id=self._session_id)
+
+    def _parse_error(self, payload: dict) -> Optional[AgentEvent]:
+        error = payload.get("error", _EMPTY)
+        return AgentEvent(_CLAUDE, _ERROR,
+                          error.get("message", "Unknown error"),
+                          session_id=self._session_id)
+
+    # Event type -> handler. Unlisted types (ping, content_block_stop, ...) are skipped.
+    _HANDLERS = {
+        "message_start": _parse_message_start,
+        "content_block_start": _parse_content_block_start,
+        "content_block_delta": _parse_content_block_delta,
+        "message_delta": _parse_message_delta,
+        "message_stop": _parse_message_stop,
+        "error": _parse_error,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Claude CLI JSONL parser (claude -p --output-format stream-json)
@@ -136,117 +234,80 @@ class ClaudeCLIParser(BaseParser):
     def __init__(self):
         self._session_id: str = ""
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
         line = line.strip()
         if not line:
             return None
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            return AgentEvent(Agent.CLAUDE, ActionType.ERROR, f"Bad JSON: {line[:80]}")
+        data = _decode_object(line)
+        if data is None:
+            return AgentEvent(_CLAUDE, _ERROR, f"Bad JSON: {_preview(line)}")
 
-        etype = data.get("type", "unknown")
-        subtype = data.get("subtype", "")
+        return self._dispatch(data)
 
+    def _dispatch(self, data: dict) -> Optional[AgentEvent]:
         # Track session ID from any event that carries it
         sid = data.get("session_id", "")
         if sid:
             self._session_id = sid
 
-        if etype == "system":
-            return self._parse_system(subtype, data)
-        elif etype == "assistant":
-            return self._parse_assistant(data)
-        elif etype == "user":
-            return self._parse_user(data)
-        elif etype == "stream_event":
-            return self._parse_stream_event(data)
-        elif etype == "result":
-            return self._parse_result(data)
-        elif etype == "tool_progress":
-            name = data.get("tool_name", "")
-            elapsed = data.get("elapsed_time_seconds", 0)
-            if elapsed > 2:
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
-                                  f"{name} ({elapsed:.0f}s...)",
-                                  session_id=self._session_id)
-            return None
-        elif etype == "tool_use_summary":
-            summary = data.get("summary", "")
-            if summary:
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_RESULT,
-                                  summary[:200], session_id=self._session_id)
-            return None
-        elif etype == "rate_limit_event":
-            info = data.get("rate_limit_info", {})
-            status = info.get("status", "")
-            if status == "rejected":
-                return AgentEvent(Agent.CLAUDE, ActionType.ERROR,
-                                  "Rate limited", session_id=self._session_id)
-            return None
-        elif etype == "auth_status":
-            if data.get("error"):
-                return AgentEvent(Agent.CLAUDE, ActionType.ERROR,
-                                  f"Auth: {data['error']}", session_id=self._session_id)
-            return None
+        handler = self._HANDLERS.get(data.get("type", "unknown"))
+        return handler(self, data) if handler else None  # Skip unknown types silently
 
-        return None  # Skip unknown types silently
-
-    def _parse_system(self, subtype: str, data: dict) -> Optional[AgentEvent]:
-        if subtype == "init":
-            model = data.get("model", "unknown")
-            tools = data.get("tools", [])
-            version = data.get("claude_code_version", "")
-            parts = [model]
-            if tools:
-                parts.append(f"{len(tools)} tools")
-            if version:
-                parts.append(f"v{version}")
-            return AgentEvent(Agent.CLAUDE, ActionType.INIT,
-                              " | ".join(parts), session_id=self._session_id)
+    def _parse_system(self, data: dict) -> Optional[AgentEvent]:
+        handler = self._SYSTEM_HANDLERS.get(data.get("subtype", ""))
+        return handler(self, data) if handler else None
+
+    def _parse_init(self, data: dict) -> Optional[AgentEvent]:
+        model = data.get("model", "unknown")
+        tools = data.get("tools", ())
+        version = data.get("claude_code_version", "")
+        parts = [model]
+        if tools:
+            parts.append(f"{len(tools)} tools")
+        if version:
+            parts.append(f"v{version}")
+        return AgentEvent(_CLAUDE, _INIT,
+                          " | ".join(parts), session_id=self._session_id)
+
+    def _parse_compact_boundary(self, data: dict) -> Optional[AgentEvent]:
+        meta = data.get("compact_metadata", _EMPTY)
+        trigger = meta.get("trigger", "auto")
+        tokens = meta.get("pre_tokens", 0)
+        return AgentEvent(_CLAUDE, _COMPACT,
+                          f"Context compacted ({trigger}, {tokens:,} tokens)",
+                          session_id=self._session_id)
+
+    def _parse_status(self, data: dict) -> Optional[AgentEvent]:
+        if data.get("status", "") == "compacting":
+            return AgentEvent(_CLAUDE, _COMPACT,
+                              "Compacting context...", session_id=self._session_id)
+        return None
 
-        elif subtype == "compact_boundary":
-            meta = data.get("compact_metadata", {})
-            trigger = meta.get("trigger", "auto")
-            tokens = meta.get("pre_tokens", 0)
-            return AgentEvent(Agent.CLAUDE, ActionType.COMPACT,
-                              f"Context compacted ({trigger}, {tokens:,} tokens)",
+    def _parse_task_started(self, data: dict) -> Optional[AgentEvent]:
+        desc = data.get("description", "")
+        return AgentEvent(_CLAUDE, _TASK_UPDATE,
+                          f"Started: {desc}", session_id=self._session_id)
+
+    def _parse_task_notification(self, data: dict) -> Optional[AgentEvent]:
+        status = data.get("status", "")
+        summary = data.get("summary", "")
+        return AgentEvent(_CLAUDE, _TASK_UPDATE,
+                          f"{status}: {summary}"[:150], session_id=self._session_id)
+
+    def _parse_task_progress(self, data: dict) -> Optional[AgentEvent]:
+        desc = data.get("description", "")
+        usage = data.get("usage", _EMPTY)
+        tools = usage.get("tool_uses", 0)
+        if tools:
+            return AgentEvent(_CLAUDE, _TASK_UPDATE,
+                              f"{desc} ({tools} tool calls)",
                               session_id=self._session_id)
-
-        elif subtype == "status":
-            status = data.get("status", "")
-            if status == "compacting":
-                return AgentEvent(Agent.CLAUDE, ActionType.COMPACT,
-                                  "Compacting context...", session_id=self._session_id)
-            return None
-
-        elif subtype == "task_started":
-            desc = data.get("description", "")
-            return AgentEvent(Agent.CLAUDE, ActionType.TASK_UPDATE,
-                              f"Started: {desc}", session_id=self._session_id)
-
-        elif subtype == "task_notification":
-            status = data.get("status", "")
-            summary = data.get("summary", "")
-            return AgentEvent(Agent.CLAUDE, ActionType.TASK_UPDATE,
-                              f"{status}: {summary}"[:150], session_id=self._session_id)
-
-        elif subtype == "task_progress":
-            desc = data.get("description", "")
-            usage = data.get("usage", {})
-            tools = usage.get("tool_uses", 0)
-            if tools:
-                return AgentEvent(Agent.CLAUDE, ActionType.TASK_UPDATE,
-                                  f"{desc} ({tools} tool calls)",
-                                  session_id=self._session_id)
-            return None
-
         return None
 
     def _parse_assistant(self, data: dict) -> Optional[AgentEvent]:
-        message = data.get("message", {})
-        content = message.get("content", [])
+        message = data.get("message", _EMPTY)
+        content = message.get("content", ())
 
         if not isinstance(content, list):
             return None
@@ -260,27 +321,27 @@ class ClaudeCLIParser(BaseParser):
             if block_type == "text":
                 text = block.get("text", "")
                 if text:
-                    return AgentEvent(Agent.CLAUDE, ActionType.TEXT_DELTA,
+                    return AgentEvent(_CLAUDE, _TEXT_DELTA,
                                       text[:400], session_id=self._session_id)
 
             elif block_type == "tool_use":
                 name = block.get("name", "?")
-                inp = block.get("input", {})
+                inp = block.get("input", _EMPTY)
                 inp_str = _summarize_tool_input(name, inp)
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
+                return AgentEvent(_CLAUDE, _TOOL_USE,
                                   f"{name} {inp_str}", session_id=self._session_id)
 
             elif block_type == "thinking":
                 text = block.get("thinking", "")
                 if text:
-                    return AgentEvent(Agent.CLAUDE, ActionType.THINKING,
+                    return AgentEvent(_CLAUDE, _THINKING,
                                       text[:200], session_id=self._session_id)
 
         return None
 
     def _parse_user(self, data: dict) -> Optional[AgentEvent]:
-        message = data.get("message", {})
-        content = message.get("content", [])
+        message = data.get("message", _EMPTY)
+        content = message.get("content", ())
 
         if not isinstance(content, list):
             return None
@@ -293,57 +354,57 @@ class ClaudeCLIParser(BaseParser):
                 is_error = block.get("is_error", False)
                 if is_error:
                     text = result_content if isinstance(result_content, str) else str(result_content)[:100]
-                    return AgentEvent(Agent.CLAUDE, ActionType.ERROR,
+                    return AgentEvent(_CLAUDE, _ERROR,
                                       f"Tool error: {text[:150]}", session_id=self._session_id)
                 if isinstance(result_content, str) and result_content.strip():
-                    return AgentEvent(Agent.CLAUDE, ActionType.TOOL_RESULT,
+                    return AgentEvent(_CLAUDE, _TOOL_RESULT,
                                       result_content[:200], session_id=self._session_id)
 
         return None
 
     def _parse_stream_event(self, data: dict) -> Optional[AgentEvent]:
-        event = data.get("event", {})
+        event = data.get("event", _EMPTY)
         event_type = event.get("type", "")
 
         if event_type == "content_block_delta":
-            delta = event.get("delta", {})
+            delta = event.get("delta", _EMPTY)
             dt = delta.get("type", "")
             if dt == "text_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.TEXT_DELTA,
+                return AgentEvent(_CLAUDE, _TEXT_DELTA,
                                   delta.get("text", ""), session_id=self._session_id)
             elif dt == "thinking_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.THINKING,
+                return AgentEvent(_CLAUDE, _THINKING,
                                   delta.get("thinking", ""), session_id=self._session_id)
             elif dt == "input_json_delta":
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
+                return AgentEvent(_CLAUDE, _TOOL_USE,
                                   delta.get("partial_json", ""), session_id=self._session_id)
             return None
 
         elif event_type == "content_block_start":
-            block = event.get("content_block", {})
+            block = event.get("content_block", _EMPTY)
             bt = block.get("type", "")
             if bt == "tool_use":
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
+                return AgentEvent(_CLAUDE, _TOOL_USE,
                                   f"Calling {block.get('name', '?')}",
                                   session_id=self._session_id)
             elif bt == "thinking":
-                return AgentEvent(Agent.CLAUDE, ActionType.THINKING,
+                return AgentEvent(_CLAUDE, _THINKING,
                                   "Thinking...", session_id=self._session_id)
             return None
 
         elif event_type == "message_start":
-            msg = event.get("message", {})
+            msg = event.get("message", _EMPTY)
             model = msg.get("model", "")
             if model:
-                return AgentEvent(Agent.CLAUDE, ActionType.MESSAGE_START,
+                return AgentEvent(_CLAUDE, _MESSAGE_START,
                                   f"Response ({model})", session_id=self._session_id)
             return None
 
         elif event_type == "message_delta":
-            delta = event.get("delta", {})
+            delta = event.get("delta", _EMPTY)
             stop = delta.get("stop_reason", "")
             if stop:
-                return AgentEvent(Agent.CLAUDE, ActionType.MESSAGE_STOP,
+                return AgentEvent(_CLAUDE, _MESSAGE_STOP,
                                   stop, session_id=self._session_id)
             return None
 
@@ -356,7 +417,7 @@ class ClaudeCLIParser(BaseParser):
             cost = data.get("total_cost_usd", 0)
             turns = data.get("num_turns", 0)
             duration = data.get("duration_ms", 0) / 1000
-            usage = data.get("usage", {})
+            usage = data.get("usage", _EMPTY)
             inp = usage.get("input_tokens", 0)
             out = usage.get("output_tokens", 0)
 
@@ -371,19 +432,72 @@ class ClaudeCLIParser(BaseParser):
                 parts.append(f"{inp:,}+{out:,} tok")
 
             return AgentEvent(
-                Agent.CLAUDE, ActionType.RESULT, " | ".join(parts),
+                _CLAUDE, _RESULT, " | ".join(parts),
                 session_id=self._session_id,
                 metadata={"total_cost_usd": cost, "num_turns": turns},
             )
 
         elif subtype.startswith("error"):
-            errors = data.get("errors", [])
+            errors = data.get("errors", ())
             msg = ", ".join(errors) if errors else subtype
-            return AgentEvent(Agent.CLAUDE, ActionType.ERROR, msg,
+            return AgentEvent(_CLAUDE, _ERROR, msg,
+                              session_id=self._session_id)
+
+        return None
+
+    def _parse_tool_progress(self, data: dict) -> Optional[AgentEvent]:
+        name = data.get("tool_name", "")
+        elapsed = data.get("elapsed_time_seconds", 0)
+        if elapsed > 2:
+            return AgentEvent(_CLAUDE, _TOOL_USE,
+                              f"{name} ({elapsed:.0f}s...)",
                               session_id=self._session_id)
+        return None
 
+    def _parse_tool_use_summary(self, data: dict) -> Optional[AgentEvent]:
+        summary = data.get("summary", "")
+        if summary:
+            return AgentEvent(_CLAUDE, _TOOL_RESULT,
+                              summary[:200], session_id=self._session_id)
         return None
 
+    def _parse_rate_limit(self, data: dict) -> Optional[AgentEvent]:
+        info = data.get("rate_limit_info", _EMPTY)
+        status = info.get("status", "")
+        if status == "rejected":
+            return AgentEvent(_CLAUDE, _ERROR,
+                              "Rate limited", session_id=self._session_id)
+        return None
+
+    def _parse_auth_status(self, data: dict) -> Optional[AgentEvent]:
+        if data.get("error"):
+            return AgentEvent(_CLAUDE, _ERROR,
+                              f"Auth: {data['error']}", session_id=self._session_id)
+        return None
+
+    # Line type -> handler
+    _HANDLERS = {
+        "system": _parse_system,
+        "assistant": _parse_assistant,
+        "user": _parse_user,
+        "stream_event": _parse_stream_event,
+        "result": _parse_result,
+        "tool_progress": _parse_tool_progress,
+        "tool_use_summary": _parse_tool_use_summary,
+        "rate_limit_event": _parse_rate_limit,
+        "auth_status": _parse_auth_status,
+    }
+
+    # system subtype -> handler
+    _SYSTEM_HANDLERS = {
+        "init": _parse_init,
+        "compact_boundary": _parse_compact_boundary,
+        "status": _parse_status,
+        "task_started": _parse_task_started,
+        "task_notification": _parse_task_notification,
+        "task_progress": _parse_task_progress,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Codex CLI JSONL parser (codex exec --json)
@@ -399,141 +513,153 @@ class CodexJSONLParser(BaseParser):
     def __init__(self):
         self._thread_id: str = ""
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
         line = line.strip()
         if not line:
             return None
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            return AgentEvent(Agent.CODEX, ActionType.ERROR, f"Bad JSON: {line[:80]}")
-
-        etype = data.get("type", "unknown")
-
-        if etype == "thread.started":
-            self._thread_id = data.get("thread_id", "")
-            short_id = self._thread_id[:8] if self._thread_id else "?"
-            return AgentEvent(Agent.CODEX, ActionType.THREAD_START,
-                              f"Thread {short_id}", session_id=self._thread_id)
-
-        elif etype == "turn.started":
-            return AgentEvent(Agent.CODEX, ActionType.TURN_START,
-                              "New turn", session_id=self._thread_id)
-
-        elif etype == "turn.completed":
-            usage = data.get("usage", {})
-            inp = usage.get("input_tokens", 0)
-            out = usage.get("output_tokens", 0)
-            cached = usage.get("cached_input_tokens", 0)
-            parts = [f"{inp:,} in"]
-            if cached:
-                parts.append(f"{cached:,} cached")
-            parts.append(f"{out:,} out")
-            return AgentEvent(Agent.CODEX, ActionType.TURN_COMPLETE,
-                              " / ".join(parts), session_id=self._thread_id,
-                              metadata={"usage": usage})
-
-        elif etype == "turn.failed":
-            error = data.get("error", {})
-            msg = error.get("message", "Unknown failure")
-            return AgentEvent(Agent.CODEX, ActionType.TURN_FAILED,
-                              msg, session_id=self._thread_id)
-
-        elif etype in ("item.started", "item.updated", "item.completed"):
-            return self._parse_item(etype, data.get("item", {}))
-
-        elif etype == "error":
-            msg = data.get("message", data.get("error", str(data)[:80]))
-            # Skip transient reconnection notices
-            if "Reconnecting" in str(msg):
-                return None
-            return AgentEvent(Agent.CODEX, ActionType.ERROR,
-                              str(msg), session_id=self._thread_id)
-
-        return None
-
-    def _parse_item(self, event_type: str, item: dict) -> Optional[AgentEvent]:
-        # Handle both old (item_type) and new (type) field names
-        item_type = item.get("type", item.get("item_type", "unknown"))
-        is_start = "started" in event_type
-        is_complete = "completed" in event_type
-
-        # Normalize old "assistant_message" to new "agent_message"
-        if item_type == "assistant_message":
-            item_type = "agent_message"
-
-        if item_type == "agent_message":
-            text = item.get("text", "")
-            if text:
-                display = text[:400] + ("..." if len(text) > 400 else "")
-                return AgentEvent(Agent.CODEX, ActionType.AGENT_MESSAGE,
-                                  display, session_id=self._thread_id)
-            return None
-
-        elif item_type == "command_execution":
-            cmd = item.get("command", "")
-            if is_start and cmd:
-                return AgentEvent(Agent.CODEX, ActionType.COMMAND,
-                                  cmd, session_id=self._thread_id)
-            elif is_complete:
-                exit_code = item.get("exit_code")
-                output = item.get("aggregated_output", "")
-                if exit_code is not None and exit_code != 0:
-                    snippet = output[:120] if output else ""
-                    return AgentEvent(
-                        Agent.CODEX, ActionType.ERROR,
-                        f"exit {exit_code}: {cmd} {snippet}".strip(),
-                        session_id=self._thread_id,
-                    )
-                elif output:
-                    snippet = output.strip()[:150]
-                    return AgentEvent(Agent.CODEX, ActionType.COMMAND,
-                                      f"{cmd} -> {snippet}",
-                                      session_id=self._thread_id)
-            return None
-
-        elif item_type == "file_change":
-            changes = item.get("changes", [])
-            parts = []
-            for c in changes[:4]:
-                path = c.get("path", "?")
-                kind = c.get("kind", "")
-                prefix = {"add": "+", "delete": "-", "update": "~"}.get(kind, "")
-                parts.append(f"{prefix}{path}")
-            summary = ", ".join(parts)
-            if len(changes) > 4:
-                summary += f" +{len(changes) - 4} more"
-            return AgentEvent(Agent.CODEX, ActionType.FILE_CHANGE,
-                              summary, session_id=self._thread_id)
-
-        elif item_type == "reasoning":
-            text = item.get("text", item.get("summary", ""))
-            if text:
-                return AgentEvent(Agent.CODEX, ActionType.REASONING,
-                                  text[:200], session_id=self._thread_id)
+        data = _decode_object(line)
+        if data is None:
+            return AgentEvent(_CODEX, _ERROR, f"Bad JSON: {_preview(line)}")
+
+        return self._dispatch(data)
+
+    def _dispatch(self, data: dict) -> Optional[AgentEvent]:
+        handler = self._HANDLERS.get(data.get("type", "unknown"))
+        return handler(self, data) if handler else None
+
+    def _parse_thread_started(self, data: dict) -> Optional[AgentEvent]:
+        self._thread_id = data.get("thread_id", "")
+        short_id = self._thread_id[:8] if self._thread_id else "?"
+        return AgentEvent(_CODEX, _THREAD_START,
+                          f"Thread {short_id}", session_id=self._thread_id)
+
+    def _parse_turn_started(self, data: dict) -> Optional[AgentEvent]:
+        return AgentEvent(_CODEX, _TURN_START,
+                          "New turn", session_id=self._thread_id)
+
+    def _parse_turn_completed(self, data: dict) -> Optional[AgentEvent]:
+        usage = data.get("usage", {})
+        inp = usage.get("input_tokens", 0)
+        out = usage.get("output_tokens", 0)
+        cached = usage.get("cached_input_tokens", 0)
+        parts = [f"{inp:,} in"]
+        if cached:
+            parts.append(f"{cached:,} cached")
+        parts.append(f"{out:,} out")
+        return AgentEvent(_CODEX, _TURN_COMPLETE,
+                          " / ".join(parts), session_id=self._thread_id,
+                          metadata={"usage": usage})
+
+    def _parse_turn_failed(self, data: dict) -> Optional[AgentEvent]:
+        error = data.get("error", _EMPTY)
+        msg = error.get("message", "Unknown failure")
+        return AgentEvent(_CODEX, _TURN_FAILED,
+                          msg, session_id=self._thread_id)
+
+    def _parse_error(self, data: dict) -> Optional[AgentEvent]:
+        msg = data.get("message", data.get("error", str(data)[:80]))
+        # Skip transient reconnection notices
+        if "Reconnecting" in str(msg):
             return None
+        return AgentEvent(_CODEX, _ERROR,
+                          str(msg), session_id=self._thread_id)
 
-        elif item_type == "mcp_tool_call":
-            server = item.get("server", "?")
-            tool = item.get("tool", "?")
-            status = item.get("status", "")
-            return AgentEvent(Agent.CODEX, ActionType.MCP_TOOL,
-                              f"{server}/{tool} ({status})",
-                              session_id=self._thread_id)
-
-        elif item_type == "web_search":
-            query = item.get("query", "")
-            return AgentEvent(Agent.CODEX, ActionType.WEB_SEARCH,
-                              query, session_id=self._thread_id)
+    def _parse_item(self, data: dict) -> Optional[AgentEvent]:
+        item = data.get("item", _EMPTY)
+        # Handle both old (item_type) and new (type) field names
+        handler = self._ITEM_HANDLERS.get(item.get("type", item.get("item_type", "unknown")))
+        return handler(self, data["type"], item) if handler else None
+
+    def _parse_agent_message(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        text = item.get("text", "")
+        if text:
+            display = text[:400] + ("..." if len(text) > 400 else "")
+            return AgentEvent(_CODEX, _AGENT_MESSAGE,
+                              display, session_id=self._thread_id)
+        return None
 
-        elif item_type == "error":
-            msg = item.get("text", item.get("message", "Unknown error"))
-            return AgentEvent(Agent.CODEX, ActionType.ERROR,
-                              str(msg), session_id=self._thread_id)
+    def _parse_command_execution(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        cmd = item.get("command", "")
+        if "started" in event_type and cmd:
+            return AgentEvent(_CODEX, _COMMAND,
+                              cmd, session_id=self._thread_id)
+        elif "completed" in event_type:
+            exit_code = item.get("exit_code")
+            output = item.get("aggregated_output", "")
+            if exit_code is not None and exit_code != 0:
+                snippet = output[:120] if output else ""
+                return AgentEvent(
+                    _CODEX, _ERROR,
+                    f"exit {exit_code}: {cmd} {snippet}".strip(),
+                    session_id=self._thread_id,
+                )
+            elif output:
+                snippet = output.strip()[:150]
+                return AgentEvent(_CODEX, _COMMAND,
+                                  f"{cmd} -> {snippet}",
+                                  session_id=self._thread_id)
+        return None
 
+    def _parse_file_change(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        changes = item.get("changes", ())
+        summary = ", ".join(
+            f"{_KIND_PREFIX.get(c.get('kind', ''), '')}{c.get('path', '?')}" for c in changes[:4]
+        )
+        if len(changes) > 4:
+            summary += f" +{len(changes) - 4} more"
+        return AgentEvent(_CODEX, _FILE_CHANGE,
+                          summary, session_id=self._thread_id)
+
+    def _parse_reasoning(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        text = item.get("text", item.get("summary", ""))
+        if text:
+            return AgentEvent(_CODEX, _REASONING,
+                              text[:200], session_id=self._thread_id)
         return None
 
+    def _parse_mcp_tool_call(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        server = item.get("server", "?")
+        tool = item.get("tool", "?")
+        status = item.get("status", "")
+        return AgentEvent(_CODEX, _MCP_TOOL,
+                          f"{server}/{tool} ({status})",
+                          session_id=self._thread_id)
+
+    def _parse_web_search(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        query = item.get("query", "")
+        return AgentEvent(_CODEX, _WEB_SEARCH,
+                          query, session_id=self._thread_id)
+
+    def _parse_item_error(self, event_type: str, item: dict) -> Optional[AgentEvent]:
+        msg = item.get("text", item.get("message", "Unknown error"))
+        return AgentEvent(_CODEX, _ERROR,
+                          str(msg), session_id=self._thread_id)
+
+    # Line type -> handler
+    _HANDLERS = {
+        "thread.started": _parse_thread_started,
+        "turn.started": _parse_turn_started,
+        "turn.completed": _parse_turn_completed,
+        "turn.failed": _parse_turn_failed,
+        "item.started": _parse_item,
+        "item.updated": _parse_item,
+        "item.completed": _parse_item,
+        "error": _parse_error,
+    }
+
+    # Item type -> handler, called with the line type ("item.started", ...)
+    _ITEM_HANDLERS = {
+        "agent_message": _parse_agent_message,
+        "assistant_message": _parse_agent_message,  # Old name for agent_message
+        "command_execution": _parse_command_execution,
+        "file_change": _parse_file_change,
+        "reasoning": _parse_reasoning,
+        "mcp_tool_call": _parse_mcp_tool_call,
+        "web_search": _parse_web_search,
+        "error": _parse_item_error,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Claude interactive session parser (~/.claude/projects/ JSONL files)
@@ -547,22 +673,27 @@ class ClaudeInteractiveParser(BaseParser):
     system, file-history-snapshot. Uses camelCase sessionId.
     """
 
+    # Snapshot lines are large and never displayed, so they're recognised by
+    # their leading top-level type and skip the JSON parse entirely. Anything
+    # the anchored match misses is still dropped after decoding (no handler).
+    _SKIP_RE = _compile_for_lines(r'^\{\s*"type"\s*:\s*"file-history-snapshot"')
+
     def __init__(self):
         self._session_id: str = ""
         self._slug: str = ""
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
         line = line.strip()
-        if not line:
+        if not line or self._SKIP_RE[type(line)].match(line):
             return None
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
+        data = _decode_object(line)
+        if data is None:
             return None  # Silently skip malformed lines in watch mode
 
-        etype = data.get("type", "")
+        return self._dispatch(data)
 
+    def _dispatch(self, data: dict) -> Optional[AgentEvent]:
         # Track session ID (camelCase in interactive format)
         sid = data.get("sessionId", "")
         if sid:
@@ -573,18 +704,10 @@ class ClaudeInteractiveParser(BaseParser):
         if slug:
             self._slug = slug
 
-        if etype == "assistant":
-            event = self._parse_assistant(data)
-        elif etype == "user":
-            event = self._parse_user(data)
-        elif etype == "progress":
-            event = self._parse_progress(data)
-        elif etype == "system":
-            event = self._parse_system(data)
-        elif etype == "file-history-snapshot":
-            return None  # Not useful for display
-        else:
+        handler = self._HANDLERS.get(data.get("type", ""))
+        if handler is None:
             return None
+        event = handler(self, data)
 
         # Attach slug to event metadata so the app can use it for labeling
         if event and self._slug:
@@ -595,8 +718,8 @@ class ClaudeInteractiveParser(BaseParser):
         return event
 
     def _parse_assistant(self, data: dict) -> Optional[AgentEvent]:
-        message = data.get("message", {})
-        content = message.get("content", [])
+        message = data.get("message", _EMPTY)
+        content = message.get("content", ())
 
         if not isinstance(content, list):
             return None
@@ -609,31 +732,31 @@ class ClaudeInteractiveParser(BaseParser):
             if block_type == "text":
                 text = block.get("text", "")
                 if text:
-                    return AgentEvent(Agent.CLAUDE, ActionType.TEXT_DELTA,
+                    return AgentEvent(_CLAUDE, _TEXT_DELTA,
                                       text[:400], session_id=self._session_id)
 
             elif block_type == "tool_use":
                 name = block.get("name", "?")
-                inp = block.get("input", {})
+                inp = block.get("input", _EMPTY)
                 inp_str = _summarize_tool_input(name, inp)
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
+                return AgentEvent(_CLAUDE, _TOOL_USE,
                                   f"{name} {inp_str}", session_id=self._session_id)
 
             elif block_type == "thinking":
                 text = block.get("thinking", "")
                 if text:
-                    return AgentEvent(Agent.CLAUDE, ActionType.THINKING,
+                    return AgentEvent(_CLAUDE, _THINKING,
                                       text[:200], session_id=self._session_id)
 
         return None
 
     def _parse_user(self, data: dict) -> Optional[AgentEvent]:
-        message = data.get("message", {})
+        message = data.get("message", _EMPTY)
         content = message.get("content", "")
 
         # Plain string = user typed a prompt
         if isinstance(content, str) and content.strip():
-            return AgentEvent(Agent.CLAUDE, ActionType.USER_PROMPT,
+            return AgentEvent(_CLAUDE, _USER_PROMPT,
                               content.strip()[:200], session_id=self._session_id)
 
         # Array = tool results
@@ -646,18 +769,18 @@ class ClaudeInteractiveParser(BaseParser):
                     result_content = block.get("content", "")
                     if is_error:
                         text = result_content if isinstance(result_content, str) else str(result_content)[:100]
-                        return AgentEvent(Agent.CLAUDE, ActionType.ERROR,
+                        return AgentEvent(_CLAUDE, _ERROR,
                                           f"Tool error: {text[:150]}",
                                           session_id=self._session_id)
                     if isinstance(result_content, str) and result_content.strip():
-                        return AgentEvent(Agent.CLAUDE, ActionType.TOOL_RESULT,
+                        return AgentEvent(_CLAUDE, _TOOL_RESULT,
                                           result_content[:200],
                                           session_id=self._session_id)
 
         return None
 
     def _parse_progress(self, data: dict) -> Optional[AgentEvent]:
-        progress = data.get("data", {})
+        progress = data.get("data", _EMPTY)
         ptype = progress.get("type", "")
 
         if ptype == "hook_progress":
@@ -668,14 +791,14 @@ class ClaudeInteractiveParser(BaseParser):
             if elapsed >= 3:
                 output = progress.get("output", "")
                 snippet = output[:80] if output else f"running ({elapsed}s)"
-                return AgentEvent(Agent.CLAUDE, ActionType.TOOL_USE,
+                return AgentEvent(_CLAUDE, _TOOL_USE,
                                   f"Bash {snippet}", session_id=self._session_id)
             return None
 
         if ptype == "agent_progress":
             prompt = progress.get("prompt", "")
             if prompt:
-                return AgentEvent(Agent.CLAUDE, ActionType.TASK_UPDATE,
+                return AgentEvent(_CLAUDE, _TASK_UPDATE,
                                   f"Subagent: {prompt[:120]}",
                                   session_id=self._session_id)
             return None
@@ -685,10 +808,19 @@ class ClaudeInteractiveParser(BaseParser):
     def _parse_system(self, data: dict) -> Optional[AgentEvent]:
         subtype = data.get("subtype", "")
         if subtype == "stop_hook_summary":
-            return AgentEvent(Agent.CLAUDE, ActionType.MESSAGE_STOP,
+            return AgentEvent(_CLAUDE, _MESSAGE_STOP,
                               "Session hook stopped", session_id=self._session_id)
         return None
 
+    # Line type -> handler. Unlisted types (file-history-snapshot, ...) are
+    # not useful for display and are skipped.
+    _HANDLERS = {
+        "assistant": _parse_assistant,
+        "user": _parse_user,
+        "progress": _parse_progress,
+        "system": _parse_system,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Codex interactive session parser (~/.codex/sessions/ JSONL files)
@@ -702,44 +834,44 @@ class CodexInteractiveParser(BaseParser):
     response_item, turn_context.  Data is nested inside a 'payload' object.
     """
 
+    # token_count event_msg lines are frequent and never displayed, so they're
+    # skipped before decoding. The match is anchored to the line's own keys
+    # (optional timestamp, type, then payload.type) so a nested object with
+    # that type can't drop an unrelated line; token_count lines written in
+    # another key order are still dropped after decoding.
+    _SKIP_RE = _compile_for_lines(
+        r'^\{\s*(?:"timestamp"\s*:\s*"[^"\\]*"\s*,\s*)?"type"\s*:\s*"event_msg"\s*,'
+        r'\s*"payload"\s*:\s*\{\s*"type"\s*:\s*"token_count"'
+    )
+
     def __init__(self):
         self._session_id: str = ""
         self._model: str = ""
-        self._cwd_project: str = ""
+        self._session_meta: dict = {}  # merged into every event's metadata
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
         line = line.strip()
-        if not line:
+        if not line or self._SKIP_RE[type(line)].match(line):
             return None
 
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
+        data = _decode_object(line)
+        if data is None:
             return None  # Silently skip malformed lines in watch mode
 
-        etype = data.get("type", "")
-        payload = data.get("payload", {})
-
-        if etype == "session_meta":
-            event = self._parse_session_meta(payload)
-        elif etype == "event_msg":
-            event = self._parse_event_msg(payload)
-        elif etype == "response_item":
-            event = self._parse_response_item(payload)
-        elif etype == "turn_context":
-            # Extract model for tracking
-            model = payload.get("model", "")
-            if model:
-                self._model = model
-            return None
-        else:
+        return self._dispatch(data)
+
+    def _dispatch(self, data: dict) -> Optional[AgentEvent]:
+        handler = self._HANDLERS.get(data.get("type", ""))
+        if handler is None:
             return None
+        event = handler(self, data.get("payload", _EMPTY))
 
         # Attach cwd_project to all events so the app can label the session
-        if event and self._cwd_project:
+        if event and self._session_meta:
             if event.metadata is None:
-                event.metadata = {}
-            event.metadata["cwd_project"] = self._cwd_project
+                event.metadata = self._session_meta.copy()
+            else:
+                event.metadata |= self._session_meta
 
         return event
 
@@ -754,7 +886,8 @@ class CodexInteractiveParser(BaseParser):
 
         # Extract project name from cwd (last path segment)
         if cwd:
-            self._cwd_project = cwd.rstrip("/").rsplit("/", 1)[-1] if "/" in cwd else cwd
+            project = cwd.rstrip("/").rsplit("/", 1)[-1] if "/" in cwd else cwd
+            self._session_meta = {"cwd_project": project}
 
         parts = [provider or "codex"]
         if version:
@@ -763,95 +896,122 @@ class CodexInteractiveParser(BaseParser):
             parts.append(cwd)
 
         return AgentEvent(
-            Agent.CODEX, ActionType.INIT,
+            _CODEX, _INIT,
             " | ".join(parts), session_id=self._session_id,
         )
 
-    def _parse_event_msg(self, payload: dict) -> Optional[AgentEvent]:
-        event_type = payload.get("type", "")
-
-        if event_type == "task_started":
-            return AgentEvent(Agent.CODEX, ActionType.TURN_START,
-                              "New turn", session_id=self._session_id)
-
-        elif event_type == "user_message":
-            text = payload.get("message", "")
-            if text:
-                return AgentEvent(Agent.CODEX, ActionType.USER_PROMPT,
-                                  str(text)[:200], session_id=self._session_id)
-            return None
-
-        elif event_type == "agent_reasoning":
-            text = payload.get("text", "")
-            if text:
-                return AgentEvent(Agent.CODEX, ActionType.REASONING,
-                                  str(text)[:200], session_id=self._session_id)
-            return None
-
-        elif event_type == "agent_message":
-            text = payload.get("message", "")
-            if text:
-                return AgentEvent(Agent.CODEX, ActionType.AGENT_MESSAGE,
-                                  str(text)[:400], session_id=self._session_id)
-            return None
-
-        elif event_type == "task_complete":
-            last_msg = payload.get("last_agent_message", "")
-            snippet = str(last_msg)[:200] if last_msg else "Done"
-            return AgentEvent(Agent.CODEX, ActionType.TURN_COMPLETE,
-                              snippet, session_id=self._session_id)
+    def _parse_turn_context(self, payload: dict) -> Optional[AgentEvent]:
+        # Extract model for tracking
+        model = payload.get("model", "")
+        if model:
+            self._model = model
+        return None
 
-        elif event_type == "token_count":
-            return None  # Too noisy
+    def _parse_event_msg(self, payload: dict) -> Optional[AgentEvent]:
+        # token_count is too noisy to show and has no handler
+        handler = self._EVENT_MSG_HANDLERS.get(payload.get("type", ""))
+        return handler(self, payload) if handler else None
+
+    def _parse_task_started(self, payload: dict) -> Optional[AgentEvent]:
+        return AgentEvent(_CODEX, _TURN_START,
+                          "New turn", session_id=self._session_id)
+
+    def _parse_user_message(self, payload: dict) -> Optional[AgentEvent]:
+        text = payload.get("message", "")
+        if text:
+            return AgentEvent(_CODEX, _USER_PROMPT,
+                              str(text)[:200], session_id=self._session_id)
+        return None
 
+    def _parse_agent_reasoning(self, payload: dict) -> Optional[AgentEvent]:
+        text = payload.get("text", "")
+        if text:
+            return AgentEvent(_CODEX, _REASONING,
+                              str(text)[:200], session_id=self._session_id)
         return None
 
-    def _parse_response_item(self, payload: dict) -> Optional[AgentEvent]:
-        item_type = payload.get("type", "")
-
-        if item_type == "function_call":
-            name = payload.get("name", "")
-            args_raw = payload.get("arguments", "")
-            cmd = _extract_codex_command(args_raw)
-            display = f"{name} {cmd}" if name else str(cmd)
-            return AgentEvent(Agent.CODEX, ActionType.COMMAND,
-                              display[:200], session_id=self._session_id)
-
-        elif item_type == "function_call_output":
-            raw = payload.get("output", "")
-            output, exit_code = _clean_codex_output(raw)
-            action = ActionType.ERROR if exit_code != 0 else ActionType.TOOL_RESULT
-            return AgentEvent(Agent.CODEX, action,
-                              output[:200], session_id=self._session_id)
-
-        elif item_type == "custom_tool_call":
-            name = payload.get("name", payload.get("tool", "?"))
-            return AgentEvent(Agent.CODEX, ActionType.TOOL_USE,
-                              name, session_id=self._session_id)
-
-        elif item_type == "custom_tool_call_output":
-            output = payload.get("output", "")
-            return AgentEvent(Agent.CODEX, ActionType.TOOL_RESULT,
-                              str(output)[:200], session_id=self._session_id)
-
-        elif item_type == "reasoning":
-            # summary is a list of objects with 'text' fields
-            summary = payload.get("summary", [])
-            if isinstance(summary, list) and summary:
-                texts = [s.get("text", "") for s in summary if isinstance(s, dict)]
-                text = " ".join(t for t in texts if t)
-            else:
-                text = str(summary) if summary else ""
-            if text:
-                return AgentEvent(Agent.CODEX, ActionType.REASONING,
-                                  text[:200], session_id=self._session_id)
-            return None
+    def _parse_agent_message(self, payload: dict) -> Optional[AgentEvent]:
+        text = payload.get("message", "")
+        if text:
+            return AgentEvent(_CODEX, _AGENT_MESSAGE,
+                              str(text)[:400], session_id=self._session_id)
+        return None
 
-        elif item_type == "message":
-            return None  # System/developer noise
+    def _parse_task_complete(self, payload: dict) -> Optional[AgentEvent]:
+        last_msg = payload.get("last_agent_message", "")
+        snippet = str(last_msg)[:200] if last_msg else "Done"
+        return AgentEvent(_CODEX, _TURN_COMPLETE,
+                          snippet, session_id=self._session_id)
 
+    def _parse_response_item(self, payload: dict) -> Optional[AgentEvent]:
+        # "message" items are system/developer noise and have no handler
+        handler = self._RESPONSE_ITEM_HANDLERS.get(payload.get("type", ""))
+        return handler(self, payload) if handler else None
+
+    def _parse_function_call(self, payload: dict) -> Optional[AgentEvent]:
+        name = payload.get("name", "")
+        args_raw = payload.get("arguments", "")
+        cmd = _extract_codex_command(args_raw)
+        display = f"{name} {cmd}" if name else str(cmd)
+        return AgentEvent(_CODEX, _COMMAND,
+                          display[:200], session_id=self._session_id)
+
+    def _parse_function_call_output(self, payload: dict) -> Optional[AgentEvent]:
+        raw = payload.get("output", "")
+        output, exit_code = _clean_codex_output(raw)
+        action = _ERROR if exit_code != 0 else _TOOL_RESULT
+        return AgentEvent(_CODEX, action,
+                          output[:200], session_id=self._session_id)
+
+    def _parse_custom_tool_call(self, payload: dict) -> Optional[AgentEvent]:
+        name = payload.get("name", payload.get("tool", "?"))
+        return AgentEvent(_CODEX, _TOOL_USE,
+                          name, session_id=self._session_id)
+
+    def _parse_custom_tool_call_output(self, payload: dict) -> Optional[AgentEvent]:
+        output = payload.get("output", "")
+        return AgentEvent(_CODEX, _TOOL_RESULT,
+                          str(output)[:200], session_id=self._session_id)
+
+    def _parse_reasoning(self, payload: dict) -> Optional[AgentEvent]:
+        # summary is a list of objects with 'text' fields
+        summary = payload.get("summary", ())
+        if isinstance(summary, list) and summary:
+            texts = [s.get("text", "") for s in summary if isinstance(s, dict)]
+            text = " ".join(t for t in texts if t)
+        else:
+            text = str(summary) if summary else ""
+        if text:
+            return AgentEvent(_CODEX, _REASONING,
+                              text[:200], session_id=self._session_id)
         return None
 
+    # Line type -> handler; the handler receives the nested payload
+    _HANDLERS = {
+        "session_meta": _parse_session_meta,
+        "event_msg": _parse_event_msg,
+        "response_item": _parse_response_item,
+        "turn_context": _parse_turn_context,
+    }
+
+    # event_msg payload type -> handler
+    _EVENT_MSG_HANDLERS = {
+        "task_started": _parse_task_started,
+        "user_message": _parse_user_message,
+        "agent_reasoning": _parse_agent_reasoning,
+        "agent_message": _parse_agent_message,
+        "task_complete": _parse_task_complete,
+    }
+
+    # response_item payload type -> handler
+    _RESPONSE_ITEM_HANDLERS = {
+        "function_call": _parse_function_call,
+        "function_call_output": _parse_function_call_output,
+        "custom_tool_call": _parse_custom_tool_call,
+        "custom_tool_call_output": _parse_custom_tool_call_output,
+        "reasoning": _parse_reasoning,
+    }
+
 
 # ---------------------------------------------------------------------------
 # Auto-detect parser
@@ -872,41 +1032,62 @@ class AutoDetectParser(BaseParser):
         "rate_limit_event", "prompt_suggestion",
     })
 
+    # One pass over the line start: an SSE field (group 1), or the leading
+    # "type" key that both CLIs emit first (group 2), read without decoding
+    _SNIFF_RE = _compile_for_lines(r'^(?:(event:|data:)|\{\s*"type"\s*:\s*"([^"\\]*)")')
+
     def __init__(self):
         self._delegate: Optional[BaseParser] = None
 
-    def parse_line(self, line: str) -> Optional[AgentEvent]:
+    def parse_line(self, line: str | bytes) -> Optional[AgentEvent]:
         if self._delegate is None:
             stripped = line.strip()
             if not stripped:
                 return None
 
+            match = self._SNIFF_RE[type(stripped)].match(stripped)
+
             # SSE format (Claude API)
-            if stripped.startswith("event:") or stripped.startswith("data:"):
+            if match and match.group(1):
                 self._delegate = ClaudeSSEParser()
 
-            # JSON format - distinguish Claude CLI vs Codex
-            elif stripped.startswith("{"):
-                try:
-                    data = json.loads(stripped)
-                    etype = data.get("type", "")
-                    if "." in etype:
-                        self._delegate = CodexJSONLParser()
-                    elif etype in self.CLAUDE_CLI_TYPES:
-                        self._delegate = ClaudeCLIParser()
-                    else:
+            # JSON format - distinguish Claude CLI vs Codex, from the leading
+            # type if possible, so the line is only decoded once (by the delegate)
+            else:
+                parser_cls = self._parser_for_type(match.group(2)) if match else None
+                if parser_cls is None:
+                    data = _decode_object(stripped)
+                    if data is None:
+                        return None
+                    parser_cls = self._parser_for_type(data.get("type", ""))
+                    if parser_cls is None:
                         # Default to Codex if has "item" field, Claude CLI otherwise
                         if "item" in data or "thread_id" in data:
-                            self._delegate = CodexJSONLParser()
+                            parser_cls = CodexJSONLParser
                         else:
-                            self._delegate = ClaudeCLIParser()
-                except json.JSONDecodeError:
-                    return None
-            else:
-                return None
+                            parser_cls = ClaudeCLIParser
+                    # Already decoded - hand the dict over rather than re-parse
+                    delegate = parser_cls()
+                    self._delegate = delegate
+                    return delegate._dispatch(data)
+                self._delegate = parser_cls()
 
         return self._delegate.parse_line(line)
 
+    def _parser_for_type(
+        self, etype: str | bytes,
+    ) -> Optional[type[ClaudeCLIParser | CodexJSONLParser]]:
+        """Parser class implied by a line's type, or None if it's ambiguous."""
+        if isinstance(etype, bytes):
+            etype = etype.decode(errors="replace")
+        elif not isinstance(etype, str):
+            return None
+        if "." in etype:
+            return CodexJSONLParser
+        if etype in self.CLAUDE_CLI_TYPES:
+            return ClaudeCLIParser
+        return None
+
     @property
     def detected_format(self) -> Optional[str]:
         if isinstance(self._delegate, ClaudeSSEParser):
@@ -947,7 +1128,7 @@ def _extract_codex_command(args_raw: str | dict) -> str:
     """Extract a command string from Codex function_call arguments."""
     if isinstance(args_raw, str):
         try:
-            args_data = json.loads(args_raw)
+            args_data = _loads(args_raw)
             return str(args_data.get("cmd", args_data.get("command", args_raw[:200])))
         except (json.JSONDecodeError, AttributeError):
             return args_raw[:200]
@@ -956,6 +1137,35 @@ def _extract_codex_command(args_raw: str | dict) -> str:
     return str(args_raw)[:200]
 
 
+# File change kind -> marker shown before the path
+_KIND_PREFIX = {"add": "+", "delete": "-", "update": "~"}
+
+
+def _decode_object(line: str | bytes) -> Optional[dict]:
+    """Decode a JSON object line, or return None if it isn't one.
+
+    Lines that can't be an object (log noise, SSE framing, bare JSON values)
+    are rejected without raising and catching a decode error. Bytes that
+    aren't valid UTF-8 are treated as malformed.
+    """
+    if line[:1] not in ("{", b"{"):
+        return None
+    try:
+        return _loads(line)
+    except ValueError:  # JSONDecodeError, or UnicodeDecodeError for bytes
+        return None
+
+
+def _preview(line: str | bytes) -> str:
+    """Start of a malformed line, for error messages."""
+    if isinstance(line, str):
+        return line[:80]
+    return line[:80].decode(errors="replace")
+
+
+_EXIT_CODE_RE = re.compile(r"^Process exited with code (-?\d+)[ \t\r]*$", re.MULTILINE)
+
+
 def _clean_codex_output(raw: str) -> tuple[str, int]:
     """Strip Codex execution metadata wrapper from function_call_output.
 
@@ -969,38 +1179,31 @@ def _clean_codex_output(raw: str) -> tuple[str, int]:
 
     Returns (cleaned_output, exit_code).
     """
-    exit_code = 0
-    # Extract exit code from metadata
-    for line in raw.split("\n"):
-        if line.startswith("Process exited with code "):
-            try:
-                exit_code = int(line.split("code ")[-1].strip())
-            except ValueError:
-                pass
-            break
-
-    # Extract actual output after "Output:\n"
-    if "\nOutput:\n" in raw:
-        output = raw.split("\nOutput:\n", 1)[1].strip()
-    elif raw.startswith("Output:\n"):
-        output = raw[len("Output:\n"):].strip()
-    else:
-        output = raw.strip()
+    # Split the metadata header from the actual output after "Output:\n"
+    header, sep, output = raw.partition("\nOutput:\n")
+    if not sep:
+        if raw.startswith("Output:\n"):
+            header, output = "", raw[len("Output:\n"):]
+        else:
+            output = raw
 
-    return output, exit_code
+    # Extract exit code from the metadata
+    match = _EXIT_CODE_RE.search(header)
+    exit_code = int(match.group(1)) if match else 0
+
+    return output.strip(), exit_code
+
+
+# Agent type -> parser class; anything else auto-detects
+_PARSER_FACTORIES: dict[str, type[BaseParser]] = {
+    "claude": ClaudeCLIParser,
+    "claude-sse": ClaudeSSEParser,
+    "claude-interactive": ClaudeInteractiveParser,
+    "codex": CodexJSONLParser,
+    "codex-interactive": CodexInteractiveParser,
+}
 
 
 def create_parser(agent_type: str) -> BaseParser:
     """Create a parser for the given agent type."""
-    if agent_type == "claude":
-        return ClaudeCLIParser()
-    elif agent_type == "claude-sse":
-        return ClaudeSSEParser()
-    elif agent_type == "claude-interactive":
-        return ClaudeInteractiveParser()
-    elif agent_type == "codex":
-        return CodexJSONLParser()
-    elif agent_type == "codex-interactive":
-        return CodexInteractiveParser()
-    else:
-        return AutoDetectParser()
+    return _PARSER_FACTORIES.get(agent_type, AutoDetectParser)()
@@ -4,10 +4,13 @@ Each source is an async generator that yields AgentEvent objects.
 """
 
 import asyncio
+import itertools
 import os
 import pathlib
+import select
 import sys
 import time
+from collections import deque
 from typing import AsyncGenerator
 
 from agentstream.events import Agent, ActionType, AgentEvent
@@ -96,6 +99,10 @@ DEMO_SCRIPT: list[tuple[float, Agent, ActionType, str, str]] = [
 DEMO_CLAUDE_SESSION = "demo-cl-a1b2c3d4"
 DEMO_CODEX_SESSION = "demo-cx-e5f6a7b8"
 
+# Offset of each DEMO_SCRIPT entry from the start of a cycle. Sleeping until an
+# absolute deadline keeps consumer latency from accumulating as drift.
+_DEMO_SCHEDULE: list[float] = list(itertools.accumulate(entry[0] for entry in DEMO_SCRIPT))
+
 
 async def demo_stream() -> AsyncGenerator[AgentEvent, None]:
     """Yield simulated demo events with realistic timing."""
@@ -104,9 +111,12 @@ async def demo_stream() -> AsyncGenerator[AgentEvent, None]:
 
     session_map = {"c": DEMO_CLAUDE_SESSION, "x": DEMO_CODEX_SESSION, "s": ""}
 
+    loop = asyncio.get_running_loop()
+
     while True:
-        for delay, agent, action, content, key in DEMO_SCRIPT:
-            await asyncio.sleep(delay)
+        t0 = loop.time()
+        for offset, (_, agent, action, content, key) in zip(_DEMO_SCHEDULE, DEMO_SCRIPT):
+            await asyncio.sleep(max(0.0, t0 + offset - loop.time()))
             yield AgentEvent(
                 agent=agent, action=action, content=content,
                 session_id=session_map.get(key, ""),
@@ -130,8 +140,10 @@ async def stdin_stream(agent_type: str) -> AsyncGenerator[AgentEvent, None]:
                      f"Reading from stdin ({agent_label})")
 
     try:
+        # Raw bytes: the parsers decode JSON from bytes directly
+        readline = sys.stdin.buffer.readline
         while True:
-            line = await loop.run_in_executor(None, sys.stdin.readline)
+            line = await loop.run_in_executor(None, readline)
             if not line:
                 break
             event = parser.parse_line(line)
@@ -149,6 +161,75 @@ async def stdin_stream(agent_type: str) -> AsyncGenerator[AgentEvent, None]:
 # File watcher stream
 # ---------------------------------------------------------------------------
 
+_READ_CHUNK = 64 * 1024  # bytes read per poll when tailing a file
+
+
+def _take_lines(pending: bytearray, chunk: bytes) -> list[bytes]:
+    """Append chunk to pending, then remove and return its complete lines.
+
+    A trailing partial line stays in pending until its newline arrives.
+    """
+    pending += chunk
+    end = pending.rfind(b"\n")
+    if end < 0:
+        return []
+    lines = bytes(pending[:end]).split(b"\n")
+    del pending[:end + 1]
+    return lines
+
+
+class _AppendWatch:
+    """Waits for a tailed file to be written to.
+
+    On macOS a kqueue vnode filter wakes the tailer as soon as the file is
+    written, so it only needs an occasional timeout to stay responsive to
+    cancellation. Elsewhere this falls back to sleeping for the poll interval.
+    """
+
+    _KQUEUE_MAX_WAIT = 1.0  # seconds between wake-ups while the file is idle
+
+    def __init__(self, f):
+        self._kq = None
+        if sys.platform == "darwin":
+            kq = None
+            try:
+                kq = select.kqueue()
+                kq.control([select.kevent(
+                    f.fileno(), filter=select.KQ_FILTER_VNODE,
+                    flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                    fflags=select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND,
+                )], 0)
+                self._kq = kq
+            except OSError:
+                # Fall back to polling, without leaking the kqueue fd
+                if kq is not None:
+                    kq.close()
+
+    def __enter__(self) -> "_AppendWatch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._kq is not None:
+            self._kq.close()
+
+    async def wait(self, interval: float) -> None:
+        if self._kq is None:
+            await asyncio.sleep(interval)
+            return
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = self._kq.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.wait_for(ready, self._KQUEUE_MAX_WAIT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fd)
+        self._kq.control(None, 8, 0)  # consume the notifications
+
+
 async def file_stream(agent_type: str, path: str) -> AsyncGenerator[AgentEvent, None]:
     """Tail a file and yield events as new lines appear."""
     parser = create_parser(agent_type)
@@ -156,15 +237,15 @@ async def file_stream(agent_type: str, path: str) -> AsyncGenerator[AgentEvent,
     yield AgentEvent(Agent.SYSTEM, ActionType.STREAM_START, f"Watching {path}")
 
     try:
-        with open(path, "r") as f:
+        with open(path, "rb") as f, _AppendWatch(f) as watch:
             f.seek(0, 2)
+            pending = bytearray()
             while True:
-                line = f.readline()
-                if not line:
-                    await asyncio.sleep(0.1)
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
+                    await watch.wait(0.1)
                     continue
-                event = parser.parse_line(line)
-                if event:
+                for event in parser.parse_lines(_take_lines(pending, chunk)):
                     yield event
     except asyncio.CancelledError:
         return
@@ -180,12 +261,31 @@ async def file_stream(agent_type: str, path: str) -> AsyncGenerator[AgentEvent,
 # Subprocess exec stream
 # ---------------------------------------------------------------------------
 
+# StreamReader buffer for subprocess pipes. The asyncio default (64 KiB) both
+# fragments bursty output into many small reads and rejects longer JSON lines.
+_EXEC_READ_LIMIT = 1024 * 1024
+_STDERR_TAIL_BYTES = 16 * 1024  # stderr kept for the failure message
+
+
 async def _drain_stderr(proc: asyncio.subprocess.Process) -> str:
-    """Read stderr in background to prevent pipe deadlocks."""
-    if proc.stderr:
-        data = await proc.stderr.read()
-        return data.decode(errors="replace").strip()
-    return ""
+    """Read stderr in background to prevent pipe deadlocks.
+
+    Only the last ``_STDERR_TAIL_BYTES`` are kept, so a verbose subprocess
+    can't grow memory without bound.
+    """
+    if not proc.stderr:
+        return ""
+    tail: deque[bytes] = deque()
+    total = 0
+    while True:
+        chunk = await proc.stderr.read(4096)
+        if not chunk:
+            break
+        tail.append(chunk)
+        total += len(chunk)
+        while total - len(tail[0]) >= _STDERR_TAIL_BYTES:
+            total -= len(tail.popleft())
+    return b"".join(tail)[-_STDERR_TAIL_BYTES:].decode(errors="replace").strip()
 
 
 async def exec_stream(agent_type: str, cmd: str) -> AsyncGenerator[AgentEvent, None]:
@@ -204,14 +304,15 @@ async def exec_stream(agent_type: str, cmd: str) -> AsyncGenerator[AgentEvent, N
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             stdin=asyncio.subprocess.DEVNULL,
+            limit=_EXEC_READ_LIMIT,
         )
 
         # Drain stderr concurrently to prevent pipe deadlock
-        stderr_task = asyncio.ensure_future(_drain_stderr(proc))
+        stderr_task = asyncio.get_running_loop().create_task(_drain_stderr(proc))
 
         if proc.stdout:
-            async for raw_line in proc.stdout:
-                line = raw_line.decode(errors="replace")
+            # Parsers take the raw bytes; the JSON decoder handles UTF-8 itself
+            async for line in proc.stdout:
                 event = parser.parse_line(line)
                 if event:
                     yield event
@@ -221,7 +322,7 @@ async def exec_stream(agent_type: str, cmd: str) -> AsyncGenerator[AgentEvent, N
 
         if exit_code != 0 and stderr_text:
             yield AgentEvent(Agent.SYSTEM, ActionType.ERROR,
-                             f"Process stderr: {stderr_text[:200]}")
+                             f"Process stderr: {stderr_text[-200:]}")
 
         yield AgentEvent(Agent.SYSTEM, ActionType.STREAM_END,
                          f"Process exited ({exit_code})")
@@ -325,29 +426,29 @@ async def _tail_session_file(
     ))
 
     try:
-        with open(path, "r") as f:
+        with open(path, "rb") as f, _AppendWatch(f) as watch:
             # Claude sessions are long-lived — seek to end, only show new events.
             # Codex sessions are per-session files — read from start to catch
             # the initial user prompt and session metadata.
             if parser_type != "codex-interactive":
                 f.seek(0, 2)
             last_data_time = time.time()
+            pending = bytearray()
 
             while True:
-                line = f.readline()
-                if not line:
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
                     if time.time() - last_data_time > _TAIL_IDLE_TIMEOUT:
                         await queue.put(AgentEvent(
                             Agent.SYSTEM, ActionType.STREAM_END,
                             f"Session idle: {project_name}/{path.stem[:8]}",
                         ))
                         return
-                    await asyncio.sleep(0.15)
+                    await watch.wait(0.15)
                     continue
 
                 last_data_time = time.time()
-                event = parser.parse_line(line)
-                if event:
+                for event in parser.parse_lines(_take_lines(pending, chunk)):
                     if event.metadata is None:
                         event.metadata = {}
                     # Prefer cwd_project from parser (e.g. Codex session_meta)
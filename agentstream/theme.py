@@ -1,6 +1,10 @@
 """AgentStream theme - colors, icons, ASCII art, rendering, and help content."""
 
-from rich.text import Text
+from functools import lru_cache
+from typing import Iterable
+
+from rich.style import Style
+from rich.text import Span, Text
 
 from agentstream.events import Agent, ActionType, AgentEvent
 
@@ -49,13 +53,17 @@ SESSION_PALETTE: list[tuple[str, str]] = [
 ]
 
 
+@lru_cache(maxsize=1024)
 def session_color(session_id: str) -> tuple[str, str]:
     """Deterministic color for a session — hash the ID into the palette."""
     idx = hash(session_id) % len(SESSION_PALETTE)
     return SESSION_PALETTE[idx]
 
-# Action-specific content colors (empty = use agent color)
+# Action-specific content colors (empty = use agent color).
+# Every ActionType has an entry so lookups never need a default.
 ACTION_STYLE: dict[ActionType, str] = {
+    ActionType.TEXT: "",
+    ActionType.TEXT_DELTA: "",
     ActionType.ERROR: "#ef4444",
     ActionType.THINKING: "#6b7280",
     ActionType.REASONING: "#6b7280",
@@ -69,11 +77,18 @@ ACTION_STYLE: dict[ActionType, str] = {
     ActionType.TURN_FAILED: "#ef4444",
     ActionType.RESULT: "#34d399",
     ActionType.INIT: "",
+    ActionType.MESSAGE_START: "",
+    ActionType.MESSAGE_STOP: "",
+    ActionType.THREAD_START: "",
+    ActionType.TURN_START: "",
+    ActionType.AGENT_MESSAGE: "",
     ActionType.COMPACT: "#64748b",
     ActionType.TASK_UPDATE: "#94a3b8",
     ActionType.USER_PROMPT: "#60a5fa",
     ActionType.STREAM_START: "#64748b",
     ActionType.STREAM_END: "#64748b",
+    ActionType.PING: "",
+    ActionType.UNKNOWN: "",
 }
 
 # ---------------------------------------------------------------------------
@@ -125,53 +140,156 @@ SEPARATOR_ACTIONS = frozenset({
 # ---------------------------------------------------------------------------
 
 
-def render_event(event: AgentEvent, colors: tuple[str, str] | None = None) -> Text:
+# Pre-built Style objects, so Rich never re-parses a style string per append
+_TS_STYLE = Style(color=SYSTEM_DIM, dim=True)
+_SEP_STYLE = Style(color=SEPARATOR_COLOR, dim=True)
+
+_EventStyles = tuple[Style, Style, Style, Style]
+
+
+def _build_styles(primary: str, dim: str, action: ActionType) -> _EventStyles:
+    """Return the (icon, agent, action label, content) styles for an event."""
+    content_color = ACTION_STYLE[action] or primary
+    return (
+        Style(color=content_color, bold=True),
+        Style(color=primary, bold=True),
+        Style(color=dim),
+        Style(color=content_color),
+    )
+
+
+# Styles for every known color pair (agent defaults and session palette)
+_STYLE_TABLE: dict[tuple[str, str, ActionType], _EventStyles] = {
+    (primary, dim, action): _build_styles(primary, dim, action)
+    for primary, dim in (*AGENT_COLORS.values(), *SESSION_PALETTE)
+    for action in ActionType
+}
+
+
+def _event_styles(primary: str, dim: str, action: ActionType) -> _EventStyles:
+    try:
+        return _STYLE_TABLE[(primary, dim, action)]
+    except KeyError:
+        # Colors outside the agent defaults and session palette
+        styles = _STYLE_TABLE[(primary, dim, action)] = _build_styles(primary, dim, action)
+        return styles
+
+
+# Padded column text, computed once per enum member
+_AGENT_LABEL: dict[Agent, str] = {a: f" {a.value.upper():6s}" for a in Agent}
+_ACTION_LABEL: dict[ActionType, str] = {a: f" {a.value:11s}" for a in ActionType}
+
+
+@lru_cache(maxsize=128)
+def _format_ts(hour: int, minute: int, second: int) -> str:
+    """HH:MM:SS without strftime; events within the same second hit the cache."""
+    return f"{hour:02d}:{minute:02d}:{second:02d}"
+
+
+def _join_columns(columns: tuple[tuple[str, Style], ...]) -> tuple[str, tuple[Span, ...]]:
+    """Join ``(text, style)`` columns into plain text plus precomputed spans."""
+    spans = []
+    offset = 0
+    for text, style in columns:
+        spans.append(Span(offset, offset + len(text), style))
+        offset += len(text)
+    return "".join(text for text, _ in columns), tuple(spans)
+
+
+@lru_cache(maxsize=4096)
+def _render_prefix(
+    ts: str, agent: Agent, action: ActionType, primary: str, dim: str,
+) -> tuple[str, tuple[Span, ...]]:
+    """Plain text and spans for the timestamp, icon, agent and action columns.
+
+    These only vary with the second and the (agent, action, colors) combination,
+    so consecutive events mostly hit the cache.
+    """
+    icon_style, agent_style, action_style, _ = _event_styles(primary, dim, action)
+    icon = ACTION_ICONS.get(action, "  ")
+
+    return _join_columns((
+        (f" {ts} ", _TS_STYLE),                  # Timestamp
+        ("|", _SEP_STYLE),
+        (f" {icon}", icon_style),                # Icon
+        (_AGENT_LABEL[agent], agent_style),      # Agent label
+        (" |", _SEP_STYLE),                      # Separator
+        (_ACTION_LABEL[action], action_style),   # Action type
+    ))
+
+
+@lru_cache(maxsize=256)
+def _render_compact_prefix(
+    agent: Agent, action: ActionType, primary: str, dim: str,
+) -> tuple[str, tuple[Span, ...]]:
+    """Compact prefix for narrow terminals: just the icon and agent columns."""
+    icon_style, agent_style, _, _ = _event_styles(primary, dim, action)
+    icon = ACTION_ICONS.get(action, "  ")
+
+    return _join_columns((
+        (f" {icon}", icon_style),                # Icon
+        (_AGENT_LABEL[agent], agent_style),      # Agent label
+        (" |", _SEP_STYLE),                      # Separator
+    ))
+
+
+def render_event(
+    event: AgentEvent, colors: tuple[str, str] | None = None, compact: bool = False,
+) -> Text:
     """Render an AgentEvent as a styled Rich Text line.
 
     *colors* overrides the agent label color with a per-session ``(primary, dim)`` pair.
+    *compact* drops the timestamp and action columns (``icon agent | content``).
     """
     primary, dim = colors or AGENT_COLORS.get(event.agent, (SYSTEM_PRIMARY, SYSTEM_DIM))
-    icon = ACTION_ICONS.get(event.action, "  ")
-    content_color = ACTION_STYLE.get(event.action, "") or primary
+    content_style = _event_styles(primary, dim, event.action)[3]
 
-    ts = event.timestamp.strftime("%H:%M:%S")
-    line = Text()
+    if compact:
+        prefix, spans = _render_compact_prefix(event.agent, event.action, primary, dim)
+    else:
+        t = event.timestamp
+        ts = _format_ts(t.hour, t.minute, t.second)
+        prefix, spans = _render_prefix(ts, event.agent, event.action, primary, dim)
+
+    # Build the line in one go; Text strips control codes from the content,
+    # so the content span is closed against the final length.
+    line = Text(f"{prefix} {event.content}", spans=list(spans))
+    line.spans.append(Span(len(prefix), len(line), content_style))
+    return line
 
-    # Timestamp
-    line.append(f" {ts} ", style=f"dim {SYSTEM_DIM}")
-    line.append("|", style=f"dim {SEPARATOR_COLOR}")
 
-    # Icon
-    line.append(f" {icon}", style=f"bold {content_color}")
+_NEWLINE = Text("\n")
 
-    # Agent label
-    agent_label = event.agent.value.upper()
-    line.append(f" {agent_label:6s}", style=f"bold {primary}")
 
-    # Separator
-    line.append(" |", style=f"dim {SEPARATOR_COLOR}")
+def join_lines(lines: Iterable[Text]) -> Text:
+    """Join rendered lines into a single Text so a batch is written at once."""
+    return _NEWLINE.join(lines)
 
-    # Action type
-    action_label = event.action.value
-    line.append(f" {action_label:11s}", style=f"{dim}")
 
-    # Content
-    line.append(f" {event.content}", style=content_color)
-
-    return line
+# Separator rules, built once
+_DASH4 = "─" * 4
+_DASH48 = "─" * 48
+_DASH58 = "─" * 58
+_SEPARATOR = Text(f" {'─' * 56} ", style=_SEP_STYLE)
 
 
 def render_separator(label: str = "") -> Text:
-    """Render a thin separator line for visual grouping."""
-    if label:
-        sep = f" {'─' * 4} {label} {'─' * max(1, 48 - len(label))} "
-    else:
-        sep = f" {'─' * 56} "
-    return Text(sep, style=f"dim {SEPARATOR_COLOR}")
+    """Render a thin separator line for visual grouping.
 
+    The returned Text is shared and must not be mutated.
+    """
+    if not label:
+        return _SEPARATOR
+    return _render_labeled_separator(label)
 
-def render_logo() -> list[Text]:
-    """Render the ASCII logo and tagline as styled Text lines."""
+
+@lru_cache(maxsize=64)
+def _render_labeled_separator(label: str) -> Text:
+    sep = f" {_DASH4} {label} {_DASH48[:max(1, 48 - len(label))]} "
+    return Text(sep, style=_SEP_STYLE)
+
+
+def _build_logo_lines() -> list[Text]:
     lines: list[Text] = [Text("")]
 
     for logo_line in LOGO.split("\n"):
@@ -185,12 +303,22 @@ def render_logo() -> list[Text]:
     lines.append(tagline)
 
     lines.append(Text(""))
-    lines.append(Text(f" {'─' * 58} ", style=f"dim {SEPARATOR_COLOR}"))
+    lines.append(Text(f" {_DASH58} ", style=_SEP_STYLE))
     lines.append(Text(""))
 
     return lines
 
 
+# The logo is constant, so build it once. RichLog.write only renders (or copies)
+# the Text it is given, so the same instances can be written repeatedly.
+_LOGO_LINES: tuple[Text, ...] = tuple(_build_logo_lines())
+
+
+def render_logo() -> list[Text]:
+    """Render the ASCII logo and tagline as styled Text lines."""
+    return list(_LOGO_LINES)
+
+
 # ---------------------------------------------------------------------------
 # Help content
 # ---------------------------------------------------------------------------
@@ -222,3 +350,6 @@ HELP_CONTENT = """\
 
 [dim]Click streams in sidebar to toggle visibility
 Press [bold]?[/bold] or [bold]Esc[/bold] to close[/]"""
+
+# Parsed once; the help screen is opened repeatedly but the markup never changes
+HELP_TEXT: Text = Text.from_markup(HELP_CONTENT)
@@ -3,6 +3,7 @@
 import json
 import pytest
 
+from agentstream import parsers
 from agentstream.events import Agent, ActionType
 from agentstream.theme import session_color, SESSION_PALETTE
 from agentstream.parsers import (
@@ -177,6 +178,13 @@ class TestClaudeCLIParser:
         assert ev is not None
         assert ev.action == ActionType.ERROR
 
+    def test_non_json_line(self):
+        p = ClaudeCLIParser()
+        ev = p.parse_line("Warning: something on stdout")
+        assert ev is not None
+        assert ev.action == ActionType.ERROR
+        assert ev.content == "Bad JSON: Warning: something on stdout"
+
     def test_unknown_type_ignored(self):
         p = ClaudeCLIParser()
         ev = p.parse_line(json.dumps({"type": "future_new_type"}))
@@ -439,6 +447,46 @@ class TestClaudeSSEParser:
         ev = p.parse_line("\n")
         assert ev is not None
         assert ev.action == ActionType.ERROR
+        assert "{broken" in ev.content
+
+    def test_multiline_data(self):
+        """Consecutive data: lines are joined with newlines, then reset."""
+        p = ClaudeSSEParser()
+        p.parse_line("event: content_block_delta\n")
+        p.parse_line('data: {"type": "content_block_delta",\n')
+        p.parse_line('data: "delta": {"type": "text_delta", "text": "Hi"}}\n')
+        ev = p.parse_line("\n")
+        assert ev is not None
+        assert ev.content == "Hi"
+        ev = self._feed(p, "message_stop", {"type": "message_stop"})
+        assert ev.action == ActionType.MESSAGE_STOP
+
+    def test_payload_with_leading_whitespace(self):
+        """Extra spaces or an empty first data: line still decode."""
+        p = ClaudeSSEParser()
+        p.parse_line("event: message_stop\n")
+        p.parse_line('data:  {"type": "message_stop"}\n')
+        ev = p.parse_line("\n")
+        assert ev is not None
+        assert ev.action == ActionType.MESSAGE_STOP
+
+        p.parse_line("event: message_stop\n")
+        p.parse_line("data:\n")
+        p.parse_line('data: {"type": "message_stop"}\n')
+        ev = p.parse_line("\n")
+        assert ev is not None
+        assert ev.action == ActionType.MESSAGE_STOP
+
+    def test_fields_without_space_and_comments(self):
+        """The space after the colon is optional; ':' lines are comments."""
+        p = ClaudeSSEParser()
+        assert p.parse_line(": keep-alive\n") is None
+        p.parse_line("event:content_block_delta\n")
+        p.parse_line('data:{"type": "content_block_delta", "delta": {"type": "text_delta", "text": " Hi"}}\n')
+        ev = p.parse_line("\n")
+        assert ev is not None
+        assert ev.action == ActionType.TEXT_DELTA
+        assert ev.content == " Hi"
 
 
 # ---------------------------------------------------------------------------
@@ -574,6 +622,30 @@ class TestClaudeInteractiveParser:
         ev = p.parse_line(line)
         assert ev is None
 
+    def test_skip_filter_ignores_quoted_type(self):
+        """A skipped type mentioned inside a string value doesn't drop the line."""
+        p = ClaudeInteractiveParser()
+        line = json.dumps({
+            "type": "user",
+            "message": {"content": 'grep \'"type": "file-history-snapshot"\' log'},
+        })
+        ev = p.parse_line(line)
+        assert ev is not None
+        assert ev.action == ActionType.USER_PROMPT
+
+    def test_skip_filter_ignores_nested_type(self):
+        """A nested object with a skipped type doesn't drop the line."""
+        p = ClaudeInteractiveParser()
+        line = json.dumps({
+            "type": "progress",
+            "data": {"type": "bash_progress", "elapsedTimeSeconds": 5, "output": "ok",
+                     "hook": {"type": "hook_progress"}},
+            "snapshot": {"type": "file-history-snapshot"},
+        })
+        ev = p.parse_line(line)
+        assert ev is not None
+        assert ev.action == ActionType.TOOL_USE
+
     def test_system_stop_hook(self):
         p = ClaudeInteractiveParser()
         line = json.dumps({
@@ -624,6 +696,12 @@ class TestClaudeInteractiveParser:
         ev = p.parse_line("{broken json")
         assert ev is None
 
+    def test_non_object_json_skipped(self):
+        """Valid JSON that isn't an object is skipped, not an AttributeError."""
+        p = ClaudeInteractiveParser()
+        assert p.parse_line("[1, 2]") is None
+        assert p.parse_line('"text"') is None
+
 
 # ---------------------------------------------------------------------------
 # Codex Interactive Parser
@@ -754,6 +832,22 @@ class TestCodexInteractiveParser:
         assert ev.action == ActionType.ERROR
         assert "module not found" in ev.content
 
+    def test_function_call_output_exit_line_in_body(self):
+        """Only the metadata header is searched for the exit code."""
+        p = CodexInteractiveParser()
+        line = json.dumps({
+            "type": "response_item",
+            "payload": {
+                "type": "function_call_output",
+                "call_id": "call_abc123",
+                "output": "Chunk ID: x\nWall time: 1.0 seconds\nProcess exited with code 0\nOriginal token count: 20\nOutput:\nProcess exited with code 2\n",
+            },
+        })
+        ev = p.parse_line(line)
+        assert ev is not None
+        assert ev.action == ActionType.TOOL_RESULT
+        assert ev.content == "Process exited with code 2"
+
     def test_function_call_output_plain(self):
         """Output without Codex wrapper is passed through as-is."""
         p = CodexInteractiveParser()
@@ -812,6 +906,35 @@ class TestCodexInteractiveParser:
         ev = p.parse_line(line)
         assert ev is None
 
+    def test_token_count_skipped_with_spacing(self):
+        """The pre-decode filter tolerates whitespace around the colon."""
+        p = CodexInteractiveParser()
+        line = '{"type": "event_msg", "payload": {"type" :  "token_count", "info": {}}}'
+        assert p.parse_line(line) is None
+
+    def test_token_count_skipped_after_timestamp(self):
+        """Rollout lines lead with a timestamp; the filter allows for it."""
+        p = CodexInteractiveParser()
+        line = json.dumps({
+            "timestamp": "2026-01-02T09:05:07.000Z",
+            "type": "event_msg",
+            "payload": {"type": "token_count", "info": None},
+        })
+        assert p.parse_line(line) is None
+
+    def test_token_count_nested_not_skipped(self):
+        """A kept event containing a token_count-typed object is still shown."""
+        p = CodexInteractiveParser()
+        line = json.dumps({
+            "type": "response_item",
+            "payload": {"type": "reasoning",
+                        "summary": [{"type": "token_count", "text": "Counting tokens"}]},
+        })
+        ev = p.parse_line(line)
+        assert ev is not None
+        assert ev.action == ActionType.REASONING
+        assert ev.content == "Counting tokens"
+
     def test_response_item_message_skipped(self):
         """System/developer message response_items are skipped."""
         p = CodexInteractiveParser()
@@ -1000,6 +1123,137 @@ class TestAutoDetectParser:
         p.parse_line(json.dumps({"type": "unknown", "item": {"type": "test"}}))
         assert p.detected_format == "codex"
 
+    def test_detects_from_leading_type(self):
+        """A leading "type" decides the format before the line is decoded."""
+        p = AutoDetectParser()
+        ev = p.parse_line('{"type": "thread.started", "thread_id": "t1", broken')
+        assert p.detected_format == "codex"
+        assert ev is not None
+        assert ev.action == ActionType.ERROR
+
+    def test_type_not_first_still_detected(self):
+        p = AutoDetectParser()
+        ev = p.parse_line(json.dumps({"thread_id": "t1", "type": "thread.started"}))
+        assert p.detected_format == "codex"
+        assert ev.action == ActionType.THREAD_START
+
+
+# ---------------------------------------------------------------------------
+# Batch parsing
+# ---------------------------------------------------------------------------
+
+class TestParseLines:
+
+    def test_batch_matches_per_line(self):
+        lines = [
+            json.dumps({"type": "thread.started", "thread_id": "t1"}),
+            "",
+            json.dumps({"type": "turn.started"}),
+            json.dumps({"type": "something.ignored"}),
+        ]
+        events = CodexJSONLParser().parse_lines(lines)
+        assert [e.action for e in events] == [ActionType.THREAD_START, ActionType.TURN_START]
+        assert all(e.session_id == "t1" for e in events)
+
+    def test_empty_batch(self):
+        assert ClaudeCLIParser().parse_lines([]) == []
+
+
+# ---------------------------------------------------------------------------
+# JSON decoders (orjson when installed, stdlib fallback otherwise)
+# ---------------------------------------------------------------------------
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_DECODERS = [
+    pytest.param(parsers._loads_stdlib, id="stdlib"),
+    pytest.param(orjson.loads if orjson else None, id="orjson",
+                 marks=pytest.mark.skipif(orjson is None, reason="orjson not installed")),
+]
+
+
+@pytest.mark.parametrize("loads", _DECODERS)
+class TestDecoders:
+
+    @pytest.fixture(autouse=True)
+    def _use_decoder(self, monkeypatch, loads):
+        monkeypatch.setattr(parsers, "_loads", loads)
+
+    def test_nan_is_bad_json(self, loads):
+        for line in ('{"type": "result", "total_cost_usd": NaN}', b'{"type": "result", "n": Infinity}'):
+            ev = ClaudeCLIParser().parse_line(line)
+            assert ev.action == ActionType.ERROR
+            assert "Bad JSON" in ev.content
+
+    def test_str_and_bytes_agree(self, loads):
+        line = json.dumps({"type": "result", "subtype": "success", "total_cost_usd": 0.5,
+                           "num_turns": 2**63 - 1, "duration_ms": 1000, "result": "ok é"})
+        a = ClaudeCLIParser().parse_line(line)
+        b = ClaudeCLIParser().parse_line(line.encode())
+        assert a.content == b.content
+        assert a.metadata == b.metadata
+        assert a.metadata["num_turns"] == 2**63 - 1
+
+    def test_invalid_utf8_is_bad_json(self, loads):
+        ev = ClaudeCLIParser().parse_line(b'{"type": "system", "x": "\xff"}')
+        assert ev.action == ActionType.ERROR
+
+    def test_integers_beyond_64_bits(self, loads):
+        """Documented difference: orjson gives a float, the stdlib an exact int."""
+        data = parsers._loads('{"n": 100000000000000000000000}')
+        expected = 1e23 if loads is not parsers._loads_stdlib else 10**23
+        assert data["n"] == expected
+        assert type(data["n"]) is type(expected)
+
+
+# ---------------------------------------------------------------------------
+# Bytes input (undecoded subprocess / file lines)
+# ---------------------------------------------------------------------------
+
+class TestBytesInput:
+
+    def test_cli_bytes_line(self):
+        p = ClaudeCLIParser()
+        line = json.dumps({
+            "type": "assistant", "session_id": "s1",
+            "message": {"content": [{"type": "text", "text": "héllo"}]},
+        }, ensure_ascii=False).encode() + b"\n"
+        ev = p.parse_line(line)
+        assert ev is not None
+        assert ev.content == "héllo"
+        assert ev.session_id == "s1"
+
+    def test_invalid_utf8_is_bad_json(self):
+        ev = CodexJSONLParser().parse_line(b'{"type": "\xff"}\n')
+        assert ev is not None
+        assert ev.action == ActionType.ERROR
+        assert ev.content.startswith("Bad JSON: {")
+
+    def test_sse_bytes(self):
+        p = ClaudeSSEParser()
+        p.parse_line(b"event: content_block_delta\n")
+        p.parse_line(b'data: {"type": "content_block_delta", "delta": {"type": "text_delta", "text": "Hi"}}\r\n')
+        ev = p.parse_line(b"\n")
+        assert ev is not None
+        assert ev.content == "Hi"
+
+    def test_interactive_skip_filter_bytes(self):
+        p = CodexInteractiveParser()
+        line = json.dumps({"type": "event_msg", "payload": {"type": "token_count"}}).encode()
+        assert p.parse_line(line) is None
+
+    def test_auto_detect_bytes(self):
+        p = AutoDetectParser()
+        ev = p.parse_line(json.dumps({"type": "thread.started", "thread_id": "t1"}).encode())
+        assert ev is not None
+        assert p.detected_format == "codex"
+        p = AutoDetectParser()
+        p.parse_line(b"event: ping\n")
+        assert p.detected_format == "claude-sse"
+
 
 # ---------------------------------------------------------------------------
 # create_parser factory
@@ -4,11 +4,18 @@ import asyncio
 import json
 import tempfile
 import os
+import pathlib
+import select
+import sys
+from types import SimpleNamespace
 
 import pytest
 
 from agentstream.events import Agent, ActionType
-from agentstream.streams import demo_stream, file_stream, exec_stream
+from agentstream.streams import (
+    _STDERR_TAIL_BYTES, _AppendWatch, _drain_stderr, _tail_session_file, _take_lines,
+    demo_stream, exec_stream, file_stream, stdin_stream,
+)
 
 
 @pytest.mark.asyncio
@@ -40,6 +47,17 @@ async def test_demo_stream_has_session_ids():
     assert len(session_ids) >= 1
 
 
+@pytest.mark.asyncio
+async def test_stdin_stream_without_buffer(monkeypatch):
+    """A replaced stdin with no .buffer should produce an error event, not raise."""
+    monkeypatch.setattr(sys, "stdin", SimpleNamespace(readline=lambda: ""))
+    events = [event async for event in stdin_stream("auto")]
+
+    actions = [e.action for e in events]
+    assert actions == [ActionType.STREAM_START, ActionType.ERROR, ActionType.STREAM_END]
+    assert "stdin error" in events[1].content
+
+
 @pytest.mark.asyncio
 async def test_file_stream_not_found():
     """file_stream should yield error for missing file."""
@@ -93,6 +111,171 @@ async def test_file_stream_reads_new_lines():
         os.unlink(path)
 
 
+@pytest.mark.asyncio
+async def test_file_stream_waits_for_complete_line():
+    """A line written in two pieces should be parsed once, when complete."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+        path = f.name
+
+    try:
+        events = []
+
+        async def collect():
+            async for event in file_stream("codex", path):
+                events.append(event)
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.3)
+
+        line = json.dumps({"type": "thread.started", "thread_id": "t1"}) + "\n"
+        with open(path, "a") as f:
+            f.write(line[:20])
+            f.flush()
+            await asyncio.sleep(0.3)
+            f.write(line[20:])
+
+        await asyncio.sleep(0.3)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        actions = [e.action for e in events]
+        assert actions == [ActionType.STREAM_START, ActionType.THREAD_START]
+    finally:
+        os.unlink(path)
+
+
+def test_take_lines_keeps_partial_line():
+    """_take_lines should return complete lines and keep the remainder."""
+    pending = bytearray()
+    assert _take_lines(pending, b'{"a"') == []
+    assert _take_lines(pending, b': 1}\n{"b": 2}\n{"c"') == [b'{"a": 1}', b'{"b": 2}']
+    assert pending == b'{"c"'
+
+
+class _FakeKqueue:
+    """Stand-in for select.kqueue: a pipe whose read end becomes readable on trigger()."""
+
+    instances: list = []
+
+    def __init__(self, fail_register=False):
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        self.fail_register = fail_register
+        self.registered = []
+        self.closed = False
+        _FakeKqueue.instances.append(self)
+
+    def fileno(self):
+        return self._r
+
+    def control(self, changelist, max_events, timeout=None):
+        if changelist:
+            if self.fail_register:
+                raise OSError("kevent failed")
+            self.registered.extend(changelist)
+            return []
+        try:
+            return list(os.read(self._r, max_events))
+        except BlockingIOError:
+            return []
+
+    def trigger(self):
+        os.write(self._w, b"x")
+
+    def close(self):
+        os.close(self._r)
+        os.close(self._w)
+        self.closed = True
+
+
+@pytest.fixture
+def fake_kqueue(monkeypatch):
+    """Make _AppendWatch take its macOS kqueue path, backed by _FakeKqueue."""
+    _FakeKqueue.instances = []
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.setattr(select, "kqueue", _FakeKqueue, raising=False)
+    monkeypatch.setattr(select, "kevent", lambda ident, **kw: SimpleNamespace(ident=ident, **kw),
+                        raising=False)
+    for name, value in [("KQ_FILTER_VNODE", -4), ("KQ_EV_ADD", 0x1), ("KQ_EV_CLEAR", 0x20),
+                        ("KQ_NOTE_WRITE", 0x2), ("KQ_NOTE_EXTEND", 0x4)]:
+        monkeypatch.setattr(select, name, getattr(select, name, value), raising=False)
+    return _FakeKqueue
+
+
+@pytest.mark.asyncio
+async def test_file_stream_kqueue_wakes_on_append(fake_kqueue):
+    """With kqueue, an append notification wakes the tailer before the idle timeout."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+        path = f.name
+
+    try:
+        events = []
+        got_thread = asyncio.Event()
+
+        async def collect():
+            async for event in file_stream("codex", path):
+                events.append(event)
+                if event.action == ActionType.THREAD_START:
+                    got_thread.set()
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.3)  # let it read to EOF and block on the kqueue
+
+        kq = fake_kqueue.instances[0]
+        [kev] = kq.registered
+        assert kev.filter == select.KQ_FILTER_VNODE
+        assert kev.flags == select.KQ_EV_ADD | select.KQ_EV_CLEAR
+        assert kev.fflags == select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND
+
+        with open(path, "a") as f:
+            f.write(json.dumps({"type": "thread.started", "thread_id": "t1"}) + "\n")
+        kq.trigger()
+
+        # Well inside the 1 s idle wait, so only the notification can explain it
+        await asyncio.wait_for(got_thread.wait(), timeout=0.5)
+        assert not kq.closed
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert kq.closed
+    finally:
+        os.unlink(path)
+
+
+def test_append_watch_closes_kqueue_if_registration_fails(fake_kqueue, monkeypatch):
+    """A kqueue that can't watch the file is closed, and polling is used instead."""
+    monkeypatch.setattr(select, "kqueue", lambda: _FakeKqueue(fail_register=True), raising=False)
+    with tempfile.TemporaryFile() as f, _AppendWatch(f) as watch:
+        assert watch._kq is None
+    assert _FakeKqueue.instances[0].closed
+
+
+@pytest.mark.skipif(sys.platform != "darwin", reason="kqueue is only used on macOS")
+@pytest.mark.asyncio
+async def test_file_stream_kqueue_darwin():
+    """On macOS the real kqueue should deliver an append before the idle timeout."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+        path = f.name
+
+    try:
+        got_thread = asyncio.Event()
+
+        async def collect():
+            async for event in file_stream("codex", path):
+                if event.action == ActionType.THREAD_START:
+                    got_thread.set()
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.3)
+        with open(path, "a") as f:
+            f.write(json.dumps({"type": "thread.started", "thread_id": "t1"}) + "\n")
+        await asyncio.wait_for(got_thread.wait(), timeout=0.5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    finally:
+        os.unlink(path)
+
+
 @pytest.mark.asyncio
 async def test_exec_stream_empty_command():
     """exec_stream should yield error for empty command."""
@@ -130,3 +313,70 @@ async def test_exec_stream_nonzero_exit():
     assert ActionType.STREAM_END in actions
     end_event = [e for e in events if e.action == ActionType.STREAM_END][0]
     assert "42" in end_event.content
+
+
+@pytest.mark.asyncio
+async def test_exec_stream_long_line():
+    """exec_stream should handle JSON lines larger than the asyncio default limit."""
+    script = ("import json; print(json.dumps({'type': 'item.completed', "
+              "'item': {'type': 'agent_message', 'text': 'x' * 200000}}))")
+    cmd = f'{sys.executable} -c "{script}"'
+    events = []
+    async for event in exec_stream("codex", cmd):
+        events.append(event)
+
+    actions = [e.action for e in events]
+    assert ActionType.AGENT_MESSAGE in actions
+    assert ActionType.ERROR not in actions
+
+
+@pytest.mark.asyncio
+async def test_exec_stream_reports_stderr_tail():
+    """On failure the end of stderr, where the real error is, should be shown."""
+    script = ("import sys; [print('noise line', i, file=sys.stderr) for i in range(3000)]; "
+              "print('FATAL: real error', file=sys.stderr); sys.exit(1)")
+    cmd = f'{sys.executable} -c "{script}"'
+    events = []
+    async for event in exec_stream("auto", cmd):
+        events.append(event)
+
+    errors = [e.content for e in events if e.action == ActionType.ERROR]
+    assert len(errors) == 1
+    assert errors[0].rstrip().endswith("FATAL: real error")
+
+
+@pytest.mark.asyncio
+async def test_drain_stderr_keeps_bounded_tail():
+    """_drain_stderr should keep only the last _STDERR_TAIL_BYTES of stderr."""
+    reader = asyncio.StreamReader()
+    reader.feed_data(b"a" * 50_000 + b"boom")
+    reader.feed_eof()
+
+    text = await _drain_stderr(SimpleNamespace(stderr=reader))
+    assert text.endswith("boom")
+    assert len(text) == _STDERR_TAIL_BYTES
+
+
+@pytest.mark.asyncio
+async def test_tail_session_file_batches_existing_lines():
+    """Codex session files are read from the start and events are enriched."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+        f.write(json.dumps({"type": "session_meta", "payload": {"id": "s1", "cwd": "/src/proj"}}) + "\n")
+        f.write(json.dumps({"type": "event_msg", "payload": {"type": "token_count"}}) + "\n")
+        f.write(json.dumps({"type": "event_msg", "payload": {"type": "user_message", "message": "hi"}}) + "\n")
+        path = pathlib.Path(f.name)
+
+    try:
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(_tail_session_file(path, queue, "rollout", "codex-interactive"))
+        events = [await asyncio.wait_for(queue.get(), timeout=2) for _ in range(3)]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert [e.action for e in events] == [
+            ActionType.STREAM_START, ActionType.INIT, ActionType.USER_PROMPT,
+        ]
+        assert all(e.session_id == "s1" for e in events[1:])
+        assert events[2].metadata["project_name"] == "proj"
+    finally:
+        os.unlink(path)
@@ -0,0 +1,94 @@
+"""Tests for AgentStream rendering helpers."""
+
+from datetime import datetime
+
+from rich.console import Console
+from rich.style import Style
+
+from agentstream.events import Agent, ActionType, AgentEvent
+from agentstream.theme import (
+    render_event, join_lines, render_logo, render_separator, ACTION_ICONS, ACTION_STYLE,
+    CLAUDE_PRIMARY, CLAUDE_DIM, SEPARATOR_COLOR, SYSTEM_DIM,
+)
+
+_console = Console(width=200)
+
+
+def _segments(text):
+    """Rendered (text, style) pairs, independent of how styles were specified."""
+    return [(seg.text, seg.style) for seg in text.render(_console) if seg.text]
+
+
+def _event(action=ActionType.TOOL_USE, content="Read foo.py", agent=Agent.CLAUDE):
+    return AgentEvent(agent, action, content, timestamp=datetime(2026, 1, 2, 9, 5, 7))
+
+
+class TestRenderEvent:
+
+    def test_plain_text_columns(self):
+        line = render_event(_event())
+        assert line.plain == " 09:05:07 | {} CLAUDE | tool_use    Read foo.py"
+
+    def test_styles(self):
+        line = render_event(_event())
+        assert _segments(line) == [
+            (" 09:05:07 ", Style.parse(f"dim {SYSTEM_DIM}")),
+            ("|", Style.parse(f"dim {SEPARATOR_COLOR}")),
+            (" {}", Style.parse("bold #fbbf24")),
+            (" CLAUDE", Style.parse(f"bold {CLAUDE_PRIMARY}")),
+            (" |", Style.parse(f"dim {SEPARATOR_COLOR}")),
+            (" tool_use   ", Style.parse(CLAUDE_DIM)),
+            (" Read foo.py", Style.parse("#fbbf24")),
+        ]
+
+    def test_content_falls_back_to_agent_color(self):
+        line = render_event(_event(ActionType.TEXT_DELTA, "hi"))
+        assert _segments(line)[-1] == (" hi", Style.parse(CLAUDE_PRIMARY))
+
+    def test_session_colors_override(self):
+        line = render_event(_event(ActionType.TEXT_DELTA, "hi"), colors=("#f472b6", "#db2777"))
+        segments = _segments(line)
+        assert segments[3] == (" CLAUDE", Style.parse("bold #f472b6"))
+        assert segments[-1] == (" hi", Style.parse("#f472b6"))
+
+    def test_repeated_renders_are_independent(self):
+        first = render_event(_event(content="one"))
+        second = render_event(_event(content="two"))
+        assert first.plain.endswith(" one")
+        assert second.plain.endswith(" two")
+        assert "one" not in second.plain
+
+    def test_control_codes_in_content(self):
+        line = render_event(_event(ActionType.TEXT_DELTA, "a\rb"))
+        assert line.plain.endswith(" ab")
+        assert _segments(line)[-1] == (" ab", Style.parse(CLAUDE_PRIMARY))
+
+    def test_compact(self):
+        line = render_event(_event(), compact=True)
+        assert line.plain == " {} CLAUDE | Read foo.py"
+        assert _segments(line)[-1] == (" Read foo.py", Style.parse("#fbbf24"))
+
+    def test_join_lines_batch(self):
+        events = [_event(content="one"), _event(ActionType.TEXT_DELTA, "two")]
+        batch = join_lines(render_event(e) for e in events)
+        assert batch.plain.split("\n") == [render_event(e).plain for e in events]
+        assert _segments(batch)[-1] == (" two", Style.parse(CLAUDE_PRIMARY))
+
+
+class TestTables:
+
+    def test_every_action_has_style_and_icon(self):
+        assert set(ACTION_STYLE) == set(ActionType)
+        assert set(ACTION_ICONS) == set(ActionType)
+
+
+class TestStaticRenders:
+
+    def test_separator(self):
+        assert render_separator().plain == f" {'─' * 56} "
+        assert render_separator("turn").plain == f" {'─' * 4} turn {'─' * 44} "
+
+    def test_logo(self):
+        lines = render_logo()
+        assert len(lines) == 7
+        assert "@ncklrs" in lines[3].plain